@@ -1,7 +1,10 @@
 import bpy
 from bpy.utils import register_class, unregister_class
 
-from .render_strip import RenderStripOperator, RsStrip, RsSettings, RENDER_UL_render_strip_list, RENDER_PT_render_strip, RENDER_PT_render_strip_detail, RENDER_PT_render_strip_settings, OBJECT_OT_NewStrip, OBJECT_OT_DeleteStrip, OBJECT_OT_PlayStrip, OBJECT_OT_CopyRenderSettings, OBJECT_OT_ApplyRenderSettings, OBJECT_MT_RenderSettingsMenu, OBJECT_OT_RenderStrip
+from .render_strip import RenderStripOperator, RsOverride, RsCollection, RsStrip, RsSettings, RENDER_UL_render_strip_list, RENDER_UL_render_strip_overrides, RENDER_UL_render_strip_collections, RENDER_PT_render_strip, RENDER_PT_render_strip_detail, RENDER_PT_render_strip_settings, RENDER_PT_render_strip_performance, OBJECT_OT_NewStrip, OBJECT_OT_DeleteStrip, OBJECT_OT_AddOverride, OBJECT_OT_DeleteOverride, OBJECT_OT_AddCollection, OBJECT_OT_DeleteCollection, OBJECT_OT_PlayStrip, OBJECT_OT_CopyRenderSettings, OBJECT_OT_ApplyRenderSettings, OBJECT_MT_RenderSettingsMenu, OBJECT_OT_ImportStrips, OBJECT_OT_ExportStrips, OBJECT_OT_StripsFromMarkers, OBJECT_MT_StripsMenu, OBJECT_OT_EstimateStrips, OBJECT_OT_RenderStrip
+from . import indexes
+from .batch import RenderStripBatchOperator
+from .parallel import RenderStripParallelOperator, OBJECT_OT_CancelParallelRender
 
 bl_info = {
     "name": "Render Strip",
@@ -12,7 +15,7 @@ bl_info = {
     "description" : "Render camera strips",
 }
 
-classes = [RenderStripOperator, RsStrip, RsSettings, RENDER_UL_render_strip_list, RENDER_PT_render_strip, RENDER_PT_render_strip_detail, RENDER_PT_render_strip_settings, OBJECT_OT_NewStrip, OBJECT_OT_DeleteStrip, OBJECT_OT_PlayStrip, OBJECT_OT_CopyRenderSettings, OBJECT_OT_ApplyRenderSettings, OBJECT_MT_RenderSettingsMenu, OBJECT_OT_RenderStrip]
+classes = [RenderStripOperator, RsOverride, RsCollection, RsStrip, RsSettings, RENDER_UL_render_strip_list, RENDER_UL_render_strip_overrides, RENDER_UL_render_strip_collections, RENDER_PT_render_strip, RENDER_PT_render_strip_detail, RENDER_PT_render_strip_settings, RENDER_PT_render_strip_performance, OBJECT_OT_NewStrip, OBJECT_OT_DeleteStrip, OBJECT_OT_AddOverride, OBJECT_OT_DeleteOverride, OBJECT_OT_AddCollection, OBJECT_OT_DeleteCollection, OBJECT_OT_PlayStrip, OBJECT_OT_CopyRenderSettings, OBJECT_OT_ApplyRenderSettings, OBJECT_MT_RenderSettingsMenu, OBJECT_OT_ImportStrips, OBJECT_OT_ExportStrips, OBJECT_OT_StripsFromMarkers, OBJECT_MT_StripsMenu, OBJECT_OT_EstimateStrips, OBJECT_OT_RenderStrip, RenderStripBatchOperator, RenderStripParallelOperator, OBJECT_OT_CancelParallelRender]
 
 def menu_func(self, context):
     self.layout.operator(OBJECT_OT_RenderStrip.bl_idname, icon="RENDER_ANIMATION")
@@ -23,8 +26,10 @@ def register():
 
     bpy.types.Scene.rs_settings = bpy.props.PointerProperty(type=RsSettings)
     bpy.types.TOPBAR_MT_render.append(menu_func)
+    indexes.register()
 
 def unregister():
+    indexes.unregister()
     for cls in classes:
         unregister_class(cls)
 
@@ -0,0 +1,182 @@
+import bpy
+import argparse
+import sys
+
+from .jobs import prepare_scene_jobs, render_job
+from .pipeline import RenderOptions, RenderPipeline
+from .planner import order_jobs
+from .telemetry import RenderTelemetry
+from .tiles import render_tile
+from .utils import validate_strips
+
+# exit status for command line renders
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_INVALID = 2
+
+# worker protocol: jobs are read from stdin, one per line, as "<name>",
+# "<name>\t<start>\t<end>" or a tile "<name>\t<frame>\t<frame>\t<x0>\t<y0>\t<x1>\t<y1>"
+# and completion is printed to stdout as DONE_PREFIX + "<status>\t<job>"
+DONE_PREFIX = "Render Strip: done "
+
+USAGE = "blender -b file.blend --python-expr \"import bpy; bpy.ops.render.renderstrip_batch(use_argv=True)\" --"
+
+
+def parse_args(argv=None):
+    if argv is None:
+        argv = sys.argv
+    argv = argv[argv.index("--")+1:] if "--" in argv else []
+    parser = argparse.ArgumentParser(prog=USAGE, description="Render strips without user interface")
+    parser.add_argument("--strips", nargs="+", metavar="NAME", help="names of strips to render (default: all enabled strips)")
+    parser.add_argument("--output", help="output root (default: scene output path)")
+    separate_dir = parser.add_mutually_exclusive_group()
+    separate_dir.add_argument("--separate-dir", dest="separate_dir", action="store_true", default=None, help="create separate directory for each strip")
+    separate_dir.add_argument("--no-separate-dir", dest="separate_dir", action="store_false", help="prefix output files with strip name")
+    parser.add_argument("--frames", nargs=2, type=int, metavar=("START", "END"), help="render only these frames of the strips")
+    parser.add_argument("--incremental", action="store_true", help="skip frames whose output is up to date")
+    parser.add_argument("--deduplicate", action="store_true", help="render frames shared by strips with same camera and render settings once")
+    parser.add_argument("--skip-static", action="store_true", help="link previous output instead of rendering frames identical to previous frame")
+    parser.add_argument("--encode", action="store_true", help="encode video of each strip while its frames are rendered")
+    parser.add_argument("--staging", action="store_true", help="render into local scratch directory and move frames to output in background")
+    parser.add_argument("--report", action="store_true", help="write timings of strips and frames next to output")
+    parser.add_argument("--worker", action="store_true", help="render strips named on stdin, one per line, until stdin is closed")
+    return parser.parse_args(argv)
+
+
+def select_strips(scene, names=None):
+    if names:
+        all_strips = { strip.name: strip for strip in scene.rs_settings.strips }
+        unknown = [name for name in names if name not in all_strips]
+        if unknown:
+            raise Exception("Unknown strips: {}".format(", ".join(unknown)))
+        strips = [all_strips[name] for name in names]
+    else:
+        strips = [strip for strip in scene.rs_settings.strips if strip.enabled]
+    return validate_strips(scene, strips)
+
+
+def render_strips(scene, strips, output=None, separate_dir=None, options=None):
+    """Render strips one after another, blocking until done. Returns names of failed strips"""
+    options = options or RenderOptions()
+    settings = scene.rs_settings
+    path = scene.render.filepath if output is None else output
+    if not path:
+        raise Exception("Output path not defined")
+    if separate_dir is None:
+        separate_dir = settings.separate_dir
+
+    telemetry = RenderTelemetry()
+    pipeline = RenderPipeline(options, lambda message: print("Render Strip: {}".format(message)))
+    with telemetry.measure("prepare"):
+        # snapshot helps revert to original
+        jobs, snapshot = prepare_scene_jobs(scene, strips, path, separate_dir)
+        jobs = order_jobs(jobs, settings.order, { name: strip.frame_estimate for name,strip in strips.items() }, scene.render.engine)
+        if options.frames is not None:
+            for job in jobs:
+                job.start = max(job.start, options.frames[0])
+                job.end = min(job.end, options.frames[1])
+            jobs = [job for job in jobs if job.start <= job.end]
+        jobs = pipeline.plan(scene, jobs, path)
+
+    failed = []
+    if options.report:
+        telemetry.start()
+    pipeline.start()
+    try:
+        for job in jobs:
+            with telemetry.switch(job.name):
+                job.apply(scene)
+            print("Render Strip: rendering {} ({}-{})".format(job.name, job.start, job.end))
+            pipeline.start_job(job)
+            try:
+                render_job(job)
+            except RuntimeError as e:
+                print("Render Strip: {} failed: {}".format(job.name, e))
+                if job.name not in failed:
+                    failed.append(job.name)
+            pipeline.job_done(job)
+    finally:
+        try:
+            snapshot.restore(scene)
+        finally:
+            failed.extend(name for name in pipeline.finish(scene) if name not in failed)
+            if options.report:
+                telemetry.stop()
+                print("Render Strip: {}".format(telemetry.save(path)))
+    return failed
+
+
+def run(scene, names=None, output=None, separate_dir=None, options=None):
+    """Render strips and return exit status"""
+    try:
+        strips = select_strips(scene, names)
+        failed = render_strips(scene, strips, output, separate_dir, options)
+    except Exception as e:
+        print("Render Strip: {}".format(e))
+        return EXIT_INVALID
+    if failed:
+        print("Render Strip: failed strips: {}".format(", ".join(failed)))
+        return EXIT_FAILED
+    print("Render Strip: rendered {} strips".format(len(strips)))
+    return EXIT_OK
+
+
+def run_tile(scene, name, frame, region, directory):
+    """Render region of frame of strip and return exit status"""
+    try:
+        strips = select_strips(scene, [name])
+        render_tile(scene, strips, frame, region, directory)
+    except RuntimeError as e:
+        print("Render Strip: {} failed: {}".format(name, e))
+        return EXIT_FAILED
+    except Exception as e:
+        print("Render Strip: {}".format(e))
+        return EXIT_INVALID
+    return EXIT_OK
+
+
+def serve(scene, output=None, separate_dir=None):
+    """Render strips named on stdin until stdin is closed and return exit status"""
+    for line in sys.stdin:
+        job = line.rstrip("\n")
+        if not job:
+            break
+        name, *fields = job.split("\t")
+        fields = [int(field) for field in fields]
+        if len(fields) == 6:
+            # tiles are written to output directory, parent stitches them
+            status = run_tile(scene, name, fields[0], tuple(fields[2:]), output)
+        else:
+            status = run(scene, [name], output, separate_dir, RenderOptions(frames=fields or None))
+        print("{}{}\t{}".format(DONE_PREFIX, status, job), flush=True)
+    return EXIT_OK
+
+
+class RenderStripBatchOperator(bpy.types.Operator):
+    """Render strips without user interface, blocking until all are done"""
+    bl_idname = "render.renderstrip_batch"
+    bl_label = "Render Strip (Batch)"
+
+    strips: bpy.props.StringProperty(name="Strips", description="Comma separated names of strips to render, all enabled strips if empty")
+    output: bpy.props.StringProperty(name="Output", description="Output root, scene output path if empty", subtype="FILE_PATH")
+    separate_dir: bpy.props.EnumProperty(name="Separate Directories", items=[
+        ("SCENE", "Scene", "Use strip output settings of scene"),
+        ("ON", "On", "Create separate directories for each strip"),
+        ("OFF", "Off", "Prefix output files with strip name"),
+    ], default="SCENE")
+    use_argv: bpy.props.BoolProperty(name="Use Command Line", description="Read options from command line arguments after '--' and exit with status code when done", default=False)
+
+    def execute(self, context):
+        if self.use_argv:
+            args = parse_args()
+            if args.worker:
+                sys.exit(serve(context.scene, args.output, args.separate_dir))
+            sys.exit(run(context.scene, args.strips, args.output, args.separate_dir, RenderOptions.from_args(args)))
+
+        names = [name.strip() for name in self.strips.split(",") if name.strip()]
+        separate_dir = { "SCENE": None, "ON": True, "OFF": False }[self.separate_dir]
+        status = run(context.scene, names, self.output or None, separate_dir, RenderOptions.from_settings(context.scene.rs_settings))
+        if status != EXIT_OK:
+            self.report({"ERROR"}, "Render Strip failed, see console for details")
+            return {"CANCELLED"}
+        return {"FINISHED"}
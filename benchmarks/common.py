@@ -0,0 +1,75 @@
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "render_strip_addon"
+
+
+def load_addon(register=True):
+    """Import addon from this checkout, whatever its directory is called"""
+    if PACKAGE in sys.modules:
+        return sys.modules[PACKAGE]
+    spec = importlib.util.spec_from_file_location(PACKAGE, os.path.join(ROOT, "__init__.py"), submodule_search_locations=[ROOT])
+    addon = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = addon
+    spec.loader.exec_module(addon)
+    if register:
+        addon.register()
+    return addon
+
+
+def script_args():
+    """Arguments after '--', as blender passes its own before them"""
+    return sys.argv[sys.argv.index("--")+1:] if "--" in sys.argv else sys.argv[1:]
+
+
+def measure(function, repeat, setup=None):
+    """Seconds of each of repeat calls of function, setup runs untimed before each call"""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def summary(samples, **params):
+    """Timings in microseconds, with parameters they were measured for"""
+    result = dict(params)
+    result.update({
+        "repeat": len(samples),
+        "median_us": round(statistics.median(samples) * 1e6, 3),
+        "mean_us": round(statistics.mean(samples) * 1e6, 3),
+        "min_us": round(min(samples) * 1e6, 3),
+        "max_us": round(max(samples) * 1e6, 3),
+    })
+    return result
+
+
+def write_results(name, results, params, output=None):
+    """Print results as JSON and save them to output if given"""
+    addon = sys.modules.get(PACKAGE)
+    bpy = sys.modules.get("bpy")
+    data = {
+        "benchmark": name,
+        "addon_version": list(addon.bl_info["version"]) if addon is not None else None,
+        "blender": getattr(getattr(bpy, "app", None), "version_string", None),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "params": params,
+        "results": results,
+    }
+    text = json.dumps(data, indent=2)
+    print(text)
+    if output:
+        with open(output, "w") as f:
+            f.write(text + "\n")
+    return data
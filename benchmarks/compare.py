@@ -0,0 +1,48 @@
+"""Compare two benchmark results and fail on regressions.
+
+python benchmarks/compare.py BASELINE.json CURRENT.json [--tolerance 0.2]
+
+Exits with status 1 when a median got slower than baseline by more than
+tolerance, e.g. 0.2 for 20%.
+"""
+import argparse
+import json
+import sys
+
+
+def medians(data):
+    """{(benchmark, parameters): median} of a results file"""
+    values = {}
+    for name,results in data["results"].items():
+        for result in results if isinstance(results, list) else [results]:
+            if "median_us" not in result:
+                continue
+            params = tuple(sorted((key, value) for key,value in result.items() if key in ("strips", "frames")))
+            values[(name, params)] = result["median_us"]
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+    with open(args.baseline) as f:
+        baseline = medians(json.load(f))
+    with open(args.current) as f:
+        current = medians(json.load(f))
+
+    regressions = 0
+    for key in sorted(set(baseline) & set(current)):
+        name, params = key
+        ratio = current[key] / baseline[key] if baseline[key] else 1
+        regressed = ratio > 1 + args.tolerance
+        regressions += regressed
+        label = name + "".join(" {}={}".format(param, value) for param,value in params)
+        print("{:<60} {:>12.3f} {:>12.3f} {:>7.2f}x{}".format(label, baseline[key], current[key], ratio, "  REGRESSION" if regressed else ""))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Cost of strip list drawing, renaming and import as number of strips grows.
+
+blender -b --factory-startup --python benchmarks/strip_ui.py -- [--strips N [N ...]] [--cameras N] [--output FILE]
+
+Prints JSON with microseconds per strip, which should stay flat with
+strip count.
+"""
+import bpy
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import common
+
+
+def add_cameras(scene, count):
+    for i in range(count):
+        camera = bpy.data.objects.new("Camera.{:03}".format(i), bpy.data.cameras.new("Camera.{:03}".format(i)))
+        scene.collection.objects.link(camera)
+
+
+def per_strip(seconds, count):
+    return round(seconds / count * 1e6, 3)
+
+
+def measure(scene, count, addon):
+    settings = scene.rs_settings
+    settings.strips.clear()
+    started = time.perf_counter()
+    for i in range(count):
+        # same name for all strips is the worst case of finding a free name
+        strip = settings.strips.add()
+        strip.name = "Strip"
+        strip.cam = "Camera.000"
+    created = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for strip in settings.strips:
+        strip.name = strip.name + "_renamed"
+    renamed = time.perf_counter() - started
+
+    # what the strip list reads from each row when drawn
+    started = time.perf_counter()
+    for strip in settings.strips:
+        strip.cam
+        strip.render_engine
+    drawn = time.perf_counter() - started
+
+    records = [addon.strip_io.strip_record(strip) for strip in settings.strips]
+    settings.strips.clear()
+    started = time.perf_counter()
+    parsed = addon.strip_io.validate_records(scene, records)
+    addon.strip_io.add_strips(settings, parsed)
+    imported = time.perf_counter() - started
+    return {
+        "strips": count,
+        "create_us_per_strip": per_strip(created, count),
+        "rename_us_per_strip": per_strip(renamed, count),
+        "draw_us_per_strip": per_strip(drawn, count),
+        "import_us_per_strip": per_strip(imported, count),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strips", nargs="+", type=int, default=[100, 1000, 5000])
+    parser.add_argument("--cameras", type=int, default=50)
+    parser.add_argument("--output", help="save JSON results to this file")
+    args = parser.parse_args(common.script_args())
+
+    addon = common.load_addon()
+    scene = bpy.context.scene
+    add_cameras(scene, args.cameras)
+    results = [measure(scene, count, addon) for count in args.strips]
+    common.write_results("strip_ui", { "strip_ui": results }, vars(args), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Minimal stand-in for bpy, enough to import the addon and run its pure Python parts.
+
+Properties declared in annotations of property groups behave like Blender
+ones: get/set callbacks are called, defaults are returned and collection
+properties support add, remove and clear.
+"""
+import sys
+import types
+
+
+class Prop:
+    DEFAULTS = {"BoolProperty": False, "IntProperty": 0, "FloatProperty": 0.0, "StringProperty": ""}
+
+    def __init__(self, kind, **options):
+        self.kind = kind
+        self.options = options
+
+    def default(self):
+        if "default" in self.options:
+            return self.options["default"]
+        items = self.options.get("items")
+        if isinstance(items, list) and items:
+            return items[0][0]
+        return self.DEFAULTS.get(self.kind)
+
+
+def props_module():
+    module = types.ModuleType("bpy.props")
+    for kind in ("BoolProperty", "IntProperty", "FloatProperty", "StringProperty", "EnumProperty", "PointerProperty", "CollectionProperty", "FloatVectorProperty", "IntVectorProperty"):
+        setattr(module, kind, lambda kind=kind, **options: Prop(kind, **options))
+    return module
+
+
+class Collection(list):
+    def __init__(self, type, id_data):
+        super().__init__()
+        self.type = type
+        self.id_data = id_data
+
+    def add(self):
+        item = self.type(self.id_data)
+        self.append(item)
+        return item
+
+    def remove(self, index):
+        del self[index]
+
+    def clear(self):
+        del self[:]
+
+
+class PropertyGroup:
+    def __init__(self, id_data=None):
+        object.__setattr__(self, "_values", {})
+        object.__setattr__(self, "_idprops", {})
+        object.__setattr__(self, "id_data", id_data)
+
+    @classmethod
+    def _props(cls):
+        # cached per class, so stub adds little to measured times
+        if "_prop_cache" not in cls.__dict__:
+            props = {}
+            for klass in reversed(cls.__mro__):
+                props.update({ name: prop for name,prop in getattr(klass, "__annotations__", {}).items() if isinstance(prop, Prop) })
+            cls._prop_cache = props
+        return cls._prop_cache
+
+    def __getattr__(self, name):
+        prop = self._props().get(name)
+        if prop is None:
+            raise AttributeError(name)
+        if prop.kind == "CollectionProperty":
+            return self._values.setdefault(name, Collection(prop.options["type"], self.id_data))
+        if "get" in prop.options:
+            return prop.options["get"](self)
+        return self._values.get(name, prop.default())
+
+    def __setattr__(self, name, value):
+        prop = self._props().get(name)
+        if prop is not None and "set" in prop.options:
+            prop.options["set"](self, value)
+            return
+        self._values[name] = value
+        if prop is not None and "update" in prop.options:
+            prop.options["update"](self, None)
+
+    def get(self, key, default=None):
+        return self._idprops.get(key, default)
+
+    def __getitem__(self, key):
+        return self._idprops[key]
+
+    def __setitem__(self, key, value):
+        self._idprops[key] = value
+
+    def __contains__(self, key):
+        return key in self._idprops
+
+    def as_pointer(self):
+        return id(self)
+
+
+class Object:
+    def __init__(self, name, type):
+        self.name = name
+        self.type = type
+
+
+class Objects(dict):
+    def __iter__(self):
+        return iter(self.values())
+
+
+class RenderSettings:
+    def __init__(self):
+        self.engine = "BLENDER_WORKBENCH"
+        self.resolution_x = 1920
+        self.resolution_y = 1080
+        self.resolution_percentage = 100
+        self.pixel_aspect_x = 1.0
+        self.pixel_aspect_y = 1.0
+        self.filepath = "/tmp/"
+
+
+class Scene:
+    def __init__(self, settings_type=None):
+        self.render = RenderSettings()
+        self.objects = Objects()
+        self.camera = None
+        self.frame_start = 1
+        self.frame_end = 250
+        self.frame_current = 1
+        self.rs_settings = settings_type(self) if settings_type is not None else None
+
+    def as_pointer(self):
+        return id(self)
+
+
+def install():
+    """Register stub bpy, bpy_extras and mathutils modules, unless running inside blender"""
+    if "bpy" in sys.modules:
+        return sys.modules["bpy"]
+    bpy = types.ModuleType("bpy")
+    bpy.props = props_module()
+    bpy.types = types.ModuleType("bpy.types")
+    for name in ("Operator", "Panel", "UIList", "Menu", "RenderEngine", "Collection", "Image", "RenderSettings"):
+        setattr(bpy.types, name, type(name, (), {}))
+    bpy.types.Object = Object
+    bpy.types.PropertyGroup = PropertyGroup
+    bpy.types.Scene = Scene
+    bpy.app = types.ModuleType("bpy.app")
+    bpy.app.handlers = types.ModuleType("bpy.app.handlers")
+    bpy.app.handlers.persistent = lambda function: function
+    bpy.app.version_string = None
+    bpy.utils = types.ModuleType("bpy.utils")
+    bpy.utils.register_class = bpy.utils.unregister_class = lambda cls: None
+    bpy.path = types.SimpleNamespace(abspath=lambda path: path, clean_name=lambda name: name)
+    bpy.context = types.SimpleNamespace(scene=None)
+    bpy.data = types.SimpleNamespace(objects=Objects(), collections={}, filepath="")
+    bpy.msgbus = types.SimpleNamespace(subscribe_rna=lambda **kwargs: None, clear_by_owner=lambda owner: None)
+
+    bpy_extras = types.ModuleType("bpy_extras")
+    bpy_extras.io_utils = types.ModuleType("bpy_extras.io_utils")
+    bpy_extras.io_utils.ImportHelper = type("ImportHelper", (), {})
+    bpy_extras.io_utils.ExportHelper = type("ExportHelper", (), {})
+    bpy_extras.object_utils = types.ModuleType("bpy_extras.object_utils")
+    bpy_extras.object_utils.world_to_camera_view = lambda scene, camera, co: co
+    mathutils = types.ModuleType("mathutils")
+    mathutils.Vector = tuple
+
+    sys.modules.update({
+        "bpy": bpy,
+        "bpy.props": bpy.props,
+        "bpy.types": bpy.types,
+        "bpy.app": bpy.app,
+        "bpy.app.handlers": bpy.app.handlers,
+        "bpy.utils": bpy.utils,
+        "bpy_extras": bpy_extras,
+        "bpy_extras.io_utils": bpy_extras.io_utils,
+        "bpy_extras.object_utils": bpy_extras.object_utils,
+        "mathutils": mathutils,
+    })
+    return bpy
@@ -0,0 +1,181 @@
+"""Overhead of the addon itself, apart from render time.
+
+Inside blender, on a tiny generated Workbench scene:
+    blender -b --factory-startup --python benchmarks/suite.py -- [options]
+Without blender, pure Python parts only, against stub bpy (needs numpy):
+    python benchmarks/suite.py [options]
+
+Options: --strips N [N ...] --frames N --repeat N --output FILE
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import common
+import stub_bpy
+
+# blender imports bpy before running scripts
+IN_BLENDER = "bpy" in sys.modules
+bpy = __import__("bpy") if IN_BLENDER else stub_bpy.install()
+
+
+def make_scene(addon, cameras):
+    if not IN_BLENDER:
+        scene = bpy.types.Scene(addon.render_strip.RsSettings)
+        for i in range(cameras):
+            name = "Camera.{:03}".format(i)
+            scene.objects[name] = bpy.types.Object(name, "CAMERA")
+        bpy.context.scene = scene
+        return scene
+    scene = bpy.context.scene
+    render = scene.render
+    render.engine = "BLENDER_WORKBENCH"
+    render.resolution_x = render.resolution_y = 32
+    render.resolution_percentage = 100
+    render.image_settings.file_format = "PNG"
+    render.filepath = os.path.join(tempfile.mkdtemp(prefix="render_strip_bench_"), "")
+    for i in range(cameras):
+        name = "Camera.{:03}".format(i)
+        camera = bpy.data.objects.new(name, bpy.data.cameras.new(name))
+        camera.location = (0, -10 - i, 2)
+        scene.collection.objects.link(camera)
+    return scene
+
+
+def make_strips(addon, scene, count, frames):
+    """Strips written like a bulk import, so setup doesn't depend on set_name"""
+    settings = scene.rs_settings
+    settings.strips.clear()
+    cameras = [obj.name for obj in scene.objects if obj.type == "CAMERA"]
+    for i in range(count):
+        strip = settings.strips.add()
+        strip["name"] = "Shot {:04}".format(i)
+        strip.cam = cameras[i % len(cameras)]
+        strip["start"] = 1
+        strip["end"] = frames
+    addon.indexes.invalidate_names(settings)
+    return settings.strips
+
+
+def bench_render_settings(addon, scene, repeat):
+    utils = addon.utils
+    current = addon.jobs.get_render_settings(scene)
+    other = (current[0], current[1] * 2) + current[2:]
+    toggle = [current, other]
+    def changed():
+        toggle.reverse()
+        utils.apply_render_settings(*toggle[0])
+    return {
+        "apply_render_settings_unchanged": common.summary(common.measure(lambda: utils.apply_render_settings(*current), repeat)),
+        "apply_render_settings_changed": common.summary(common.measure(changed, repeat)),
+    }
+
+
+def bench_copy_render_settings(addon, scene, repeat):
+    strip = make_strips(addon, scene, 1, 1)[0]
+    return { "copy_render_settings": common.summary(common.measure(lambda: addon.utils.copy_render_settings(strip), repeat)) }
+
+
+def bench_set_name(addon, scene, counts, repeat):
+    unique = []
+    colliding = []
+    new = []
+    for count in counts:
+        strips = make_strips(addon, scene, count, 1)
+        target = strips[-1]
+        names = ["Renamed A", "Renamed B"]
+        def rename_unique():
+            names.reverse()
+            target.name = names[0]
+        unique.append(common.summary(common.measure(rename_unique, repeat), strips=count))
+        # taken name, so next free one is looked up
+        colliding.append(common.summary(common.measure(lambda: setattr(target, "name", "Shot 0000"), repeat), strips=count))
+
+        # strips named like rs.newstrip makes them: Strip, Strip.001, ...
+        settings = scene.rs_settings
+        settings.strips.clear()
+        for i in range(count):
+            settings.strips.add()["name"] = "Strip.{:03}".format(i) if i else "Strip"
+        addon.indexes.invalidate_names(settings)
+        def new_strip():
+            # as rs.newstrip, next free suffix is looked up
+            settings.strips.add().name = "Strip"
+        new.append(common.summary(common.measure(new_strip, repeat), strips=count))
+    return { "set_name_unique": unique, "set_name_colliding": colliding, "set_name_new_strip": new }
+
+
+def bench_validation(addon, scene, counts, frames, repeat):
+    """Validation and job preparation done by RenderStripOperator.execute before first render"""
+    results = []
+    for count in counts:
+        make_strips(addon, scene, count, frames)
+        settings = scene.rs_settings
+        def validate():
+            strips = addon.utils.validate_strips(scene, [strip for strip in settings.strips if strip.enabled])
+            if IN_BLENDER:
+                jobs, snapshot = addon.jobs.prepare_scene_jobs(scene, strips, scene.render.filepath, settings.separate_dir)
+                addon.planner.order_jobs(jobs, settings.order, { name: strip.frame_estimate for name,strip in strips.items() }, scene.render.engine)
+                snapshot.restore(scene)
+            else:
+                # overrides and snapshot need RNA, only resolving strips runs here
+                addon.jobs.prepare_jobs(strips, scene.render.filepath, True, addon.jobs.get_render_settings(scene))
+        results.append(common.summary(common.measure(validate, repeat), strips=count, frames=frames))
+    return { "execute_validation": results }
+
+
+def bench_dispatch(addon, scene, counts, frames):
+    """Time between end of one strip render and start of next, as rendered by batch mode"""
+    results = []
+    for count in counts:
+        strips = addon.utils.validate_strips(scene, list(make_strips(addon, scene, count, frames)))
+        events = []
+        def init(*args):
+            events.append(("init", time.perf_counter()))
+        def complete(*args):
+            events.append(("complete", time.perf_counter()))
+        bpy.app.handlers.render_init.append(init)
+        bpy.app.handlers.render_complete.append(complete)
+        try:
+            started = time.perf_counter()
+            addon.batch.render_strips(scene, strips)
+            total = time.perf_counter() - started
+        finally:
+            bpy.app.handlers.render_init.remove(init)
+            bpy.app.handlers.render_complete.remove(complete)
+        gaps = [after[1] - before[1] for before,after in zip(events, events[1:]) if before[0] == "complete" and after[0] == "init"]
+        if gaps:
+            result = common.summary(gaps, strips=count, frames=frames)
+            result["total_s"] = round(total, 3)
+            results.append(result)
+    return { "dispatch_latency": results }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--strips", nargs="+", type=int, default=[10, 100, 1000], help="strip counts to measure with")
+    parser.add_argument("--frames", type=int, default=3, help="frames of each strip")
+    parser.add_argument("--repeat", type=int, default=200, help="calls timed per measurement")
+    parser.add_argument("--cameras", type=int, default=4)
+    parser.add_argument("--dispatch-strips", nargs="+", type=int, default=[5, 20], help="strip counts rendered to measure dispatch latency, blender only")
+    parser.add_argument("--output", help="save JSON results to this file")
+    args = parser.parse_args(common.script_args())
+
+    addon = common.load_addon(register=IN_BLENDER)
+    scene = make_scene(addon, args.cameras)
+    results = {}
+    results.update(bench_render_settings(addon, scene, args.repeat))
+    results.update(bench_copy_render_settings(addon, scene, args.repeat))
+    results.update(bench_set_name(addon, scene, args.strips, args.repeat))
+    results.update(bench_validation(addon, scene, args.strips, args.frames, max(1, args.repeat // 10)))
+    if IN_BLENDER:
+        results.update(bench_dispatch(addon, scene, args.dispatch_strips, args.frames))
+    params = vars(args)
+    params["mode"] = "blender" if IN_BLENDER else "stub"
+    common.write_results("suite", results, params, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import bpy
+import os
+import queue
+import shlex
+import shutil
+import subprocess
+import threading
+
+from .planner import link_outputs
+
+
+def find_ffmpeg(path=""):
+    ffmpeg = bpy.path.abspath(path) if path else shutil.which("ffmpeg")
+    if not ffmpeg or not os.path.exists(ffmpeg):
+        raise Exception("ffmpeg not found, set its path in performance settings")
+    return ffmpeg
+
+
+class StripEncoder:
+    """ffmpeg process encoding frames of a strip, fed in frame order from a bounded queue"""
+
+    def __init__(self, args, paths, pending, links, queue_size):
+        self.paths = paths
+        self.next = min(paths)
+        self.end = max(paths)
+        # frames rendered in this run, others already exist or are linked
+        self.pending = pending
+        self.ready = set()
+        self.links = links
+        self.error = None
+        # frames may be reported from render and transfer threads
+        self.lock = threading.Lock()
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.process = subprocess.Popen(args, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+        self.thread = threading.Thread(target=self._write, daemon=True)
+        self.thread.start()
+
+    def _write(self):
+        try:
+            while True:
+                path = self.queue.get()
+                if path is None:
+                    break
+                with open(path, "rb") as f:
+                    self.process.stdin.write(f.read())
+            self.process.stdin.close()
+            # communicate would flush closed stdin
+            stderr = self.process.stderr.read()
+            self.process.wait()
+            if self.process.returncode != 0:
+                self.error = stderr.decode(errors="replace").strip() or "ffmpeg exited with {}".format(self.process.returncode)
+        except (OSError, ValueError) as e:
+            self.error = str(e)
+            self.process.kill()
+
+    def feed(self):
+        while self.next <= self.end:
+            frame = self.next
+            if frame in self.pending and frame not in self.ready:
+                break
+            path = self.paths[frame]
+            if frame in self.links and not os.path.exists(path):
+                link_outputs([(self.links[frame], path)])
+            if os.path.exists(path):
+                # blocks render when encoder falls behind
+                self.queue.put(path)
+            self.next += 1
+
+    def frame_written(self, frame):
+        with self.lock:
+            self.ready.add(frame)
+            self.feed()
+
+    def finish(self):
+        with self.lock:
+            self.ready.update(self.pending)
+            self.feed()
+            self.queue.put(None)
+
+
+class EncodeStage:
+    """Encode video of each strip while its frames are rendered.
+
+    ffmpeg of a strip is started with its first job, strips without frames
+    to render are encoded one after another once rendering is done.
+    """
+
+    def __init__(self, scene, strip_jobs, planned_jobs, links, ffmpeg, encode_args, queue_size):
+        self.fps = scene.render.fps / scene.render.fps_base
+        self.ffmpeg = ffmpeg
+        self.encode_args = encode_args
+        self.queue_size = queue_size
+        linked = dict((destination, source) for source,destination in links)
+        self.strips = {}
+        self.encoders = {}
+        self.remaining = {}
+        self.videos = {}
+        for job in planned_jobs:
+            self.remaining[job.name] = self.remaining.get(job.name, 0) + 1
+        for job in strip_jobs:
+            paths = job.frame_paths(scene)
+            pending = set(frame for planned in planned_jobs if planned.name == job.name for frame in range(planned.start, planned.end+1))
+            links = { frame: linked[path] for frame,path in paths.items() if path in linked }
+            self.strips[job.name] = (paths, pending, links)
+            self.videos[job.name] = bpy.path.abspath(job.filepath.rstrip("/.") + ".mp4")
+
+    def start(self, name):
+        """Start ffmpeg of strip, unless already running"""
+        if name not in self.encoders:
+            video = self.videos[name]
+            os.makedirs(os.path.dirname(video), exist_ok=True)
+            args = [self.ffmpeg, "-y", "-loglevel", "error", "-f", "image2pipe", "-framerate", str(self.fps), "-i", "-"] + shlex.split(self.encode_args) + [video]
+            self.encoders[name] = StripEncoder(args, *self.strips[name], self.queue_size)
+        return self.encoders[name]
+
+    def frame_written(self, name, frame):
+        self.encoders[name].frame_written(frame)
+
+    def job_done(self, name):
+        self.remaining[name] -= 1
+        if self.remaining[name] == 0:
+            self.encoders[name].finish()
+
+    def close(self):
+        """Wait for all videos. Returns {strip name: error} of failed ones"""
+        for name,encoder in self.encoders.items():
+            if self.remaining.get(name, 0) > 0:
+                # cancelled, finish with frames rendered so far
+                encoder.finish()
+            encoder.thread.join()
+        for name in self.strips:
+            if name not in self.remaining:
+                # every frame up to date or linked
+                encoder = self.start(name)
+                encoder.finish()
+                encoder.thread.join()
+        return { name: encoder.error for name,encoder in self.encoders.items() if encoder.error }
+
+    def remove_frames(self, failed):
+        """Delete image sequences of strips whose video was encoded"""
+        for name,encoder in self.encoders.items():
+            if name in failed:
+                continue
+            for path in encoder.paths.values():
+                if os.path.exists(path):
+                    os.remove(path)
@@ -0,0 +1,167 @@
+import bpy
+import re
+from bpy.app.handlers import persistent
+
+from .utils import get_available_render_engines
+
+# owner of message bus subscriptions
+subscriber = object()
+
+# enum items of camera objects, by scene pointer
+cameras = {}
+# enum items of render engines, None until first use
+engines = None
+# {name: number of strips with it} and strip count it was built for, by settings pointer
+names = {}
+# {(base name, digits): lowest suffix which may be free} by settings pointer, all below it are taken
+suffixes = {}
+
+
+def camera_items(scene):
+    """Enum items of cameras in scene, rebuilt only after objects changed"""
+    key = scene.as_pointer()
+    if key not in cameras:
+        # enum callbacks must keep references to returned strings
+        cameras[key] = [(obj.name, obj.name, obj.name) for obj in scene.objects if obj.type == "CAMERA"]
+    return cameras[key]
+
+
+def engine_items():
+    global engines
+    if engines is None:
+        engines = get_available_render_engines()
+    return engines
+
+
+def has_engine(engine):
+    """Whether engine is available, rescanning once as it may have been registered since"""
+    if engine in (item[0] for item in engine_items()):
+        return True
+    invalidate_engines()
+    return engine in (item[0] for item in engine_items())
+
+
+def strip_names(settings):
+    """{name: count} of strips in settings, updated for appended strips without full rescan"""
+    key = settings.as_pointer()
+    strips = settings.strips
+    index, count = names.get(key, (None, -1))
+    if index is not None and count + 1 == len(strips):
+        # strip appended since last use
+        name = strips[-1].name
+        index[name] = index.get(name, 0) + 1
+        count += 1
+    if index is None or count != len(strips):
+        # strips were removed, freed suffixes aren't known
+        suffixes.pop(key, None)
+        index = {}
+        for strip in strips:
+            index[strip.name] = index.get(strip.name, 0) + 1
+        count = len(strips)
+    names[key] = (index, count)
+    return index
+
+
+def split_name(name):
+    """Base name and numeric suffix of name.001, suffix is None without one"""
+    match = re.search(r'\.(\d+)$', name)
+    if match is None:
+        return name, None
+    return name[:match.start()], match.group(1)
+
+
+def free_name(settings, name, taken):
+    """name, or name with lowest suffix not taken, without rescanning suffixes taken by earlier calls"""
+    base, number = split_name(name)
+    if not taken(base):
+        return base
+    digits = 3 if number is None else len(number)
+    hints = suffixes.setdefault(settings.as_pointer(), {})
+    count = hints.get((base, digits), 1)
+    value = "{}.{:0>{}}".format(base, count, digits)
+    while taken(value):
+        count += 1
+        value = "{}.{:0>{}}".format(base, count, digits)
+    # value is assigned by caller
+    hints[(base, digits)] = count + 1
+    return value
+
+
+def rename_strip(settings, old, new):
+    index = strip_names(settings)
+    index[old] -= 1
+    if index[old] == 0:
+        del index[old]
+        base, number = split_name(old)
+        hints = suffixes.get(settings.as_pointer())
+        if number is not None and hints is not None and int(number) < hints.get((base, len(number)), 0):
+            # suffix freed, found first by next free_name
+            hints[(base, len(number))] = int(number)
+    index[new] = index.get(new, 0) + 1
+
+
+def invalidate_names(settings):
+    names.pop(settings.as_pointer(), None)
+    suffixes.pop(settings.as_pointer(), None)
+
+
+def invalidate_cameras(*args):
+    cameras.clear()
+
+
+def invalidate_engines(*args):
+    global engines
+    engines = None
+
+
+def invalidate_all(*args):
+    cameras.clear()
+    names.clear()
+    suffixes.clear()
+    invalidate_engines()
+
+
+@persistent
+def depsgraph_update(scene, depsgraph=None):
+    if depsgraph is None or depsgraph.id_type_updated("OBJECT") or depsgraph.id_type_updated("SCENE"):
+        # objects added, removed or linked to scene
+        cameras.pop(scene.as_pointer(), None)
+
+
+@persistent
+def undo_changed(*args):
+    # strips and objects are reallocated
+    invalidate_all()
+
+
+@persistent
+def file_loaded(*args):
+    invalidate_all()
+    # loading a file clears message bus
+    subscribe()
+
+
+def subscribe():
+    bpy.msgbus.clear_by_owner(subscriber)
+    # renamed or retyped objects don't always reach depsgraph handlers
+    bpy.msgbus.subscribe_rna(key=(bpy.types.Object, "name"), owner=subscriber, args=(), notify=invalidate_cameras)
+    bpy.msgbus.subscribe_rna(key=(bpy.types.Object, "data"), owner=subscriber, args=(), notify=invalidate_cameras)
+    # engines of newly enabled addons are listed once engine is switched
+    bpy.msgbus.subscribe_rna(key=(bpy.types.RenderSettings, "engine"), owner=subscriber, args=(), notify=invalidate_engines)
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(depsgraph_update)
+    bpy.app.handlers.load_post.append(file_loaded)
+    bpy.app.handlers.undo_post.append(undo_changed)
+    bpy.app.handlers.redo_post.append(undo_changed)
+    subscribe()
+
+
+def unregister():
+    bpy.msgbus.clear_by_owner(subscriber)
+    bpy.app.handlers.depsgraph_update_post.remove(depsgraph_update)
+    bpy.app.handlers.load_post.remove(file_loaded)
+    bpy.app.handlers.undo_post.remove(undo_changed)
+    bpy.app.handlers.redo_post.remove(undo_changed)
+    invalidate_all()
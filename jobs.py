@@ -0,0 +1,121 @@
+import bpy
+from collections import deque
+
+from .overrides import RenderSnapshot, order_overrides, set_value, validate_overrides
+from .utils import apply_render_settings, strip_output_path
+from .visibility import VisibilitySnapshot, apply_visibility, validate_visibility
+
+
+def get_render_settings(scene):
+    render = scene.render
+    return (render.engine, render.resolution_x, render.resolution_y, render.resolution_percentage, render.pixel_aspect_x, render.pixel_aspect_y)
+
+
+def get_strip_render_settings(strip):
+    return (strip.render_engine, strip.resolution_x, strip.resolution_y, strip.resolution_percentage, strip.pixel_aspect_x, strip.pixel_aspect_y)
+
+
+class StripJob:
+    """Strip resolved to everything needed to render it"""
+
+    def __init__(self, name, cam, start, end, filepath, render_settings, overrides=(), visibility=()):
+        self.name = name
+        self.cam = cam
+        self.start = start
+        self.end = end
+        self.filepath = filepath
+        self.render_settings = render_settings
+        # ((path, value), ...) of every overridden property, including defaults
+        self.overrides = overrides
+        # (((kind, name), value), ...) of every collection and view layer toggle, empty when no strip is scoped
+        self.visibility = visibility
+
+    def split(self, start, end):
+        return StripJob(self.name, self.cam, start, end, self.filepath, self.render_settings, self.overrides, self.visibility)
+
+    def settings_key(self):
+        return (self.render_settings, tuple(sorted(self.overrides)), self.visibility)
+
+    def engine(self):
+        return dict(self.overrides).get("render.engine", self.render_settings[0])
+
+    def overwrite(self, scene):
+        """Whether existing outputs are rendered again"""
+        return dict(self.overrides).get("render.use_overwrite", scene.render.use_overwrite)
+
+    def pixel_size(self):
+        """Width and height of rendered frames, after resolution percentage"""
+        overrides = dict(self.overrides)
+        resolution_x, resolution_y, percentage = (overrides.get("render." + name, value) for name,value in zip(("resolution_x", "resolution_y", "resolution_percentage"), self.render_settings[1:4]))
+        return resolution_x * percentage // 100, resolution_y * percentage // 100
+
+    def frame_paths(self, scene):
+        # output file name depends on file format
+        output_overrides = [(path, value) for path,value in self.overrides if path.startswith("render.image_settings.") or path == "render.use_file_extension"]
+        snapshot = RenderSnapshot(scene, [path for path,_ in output_overrides])
+        scene.render.filepath = self.filepath
+        for path,value in output_overrides:
+            set_value(scene, path, value)
+        try:
+            return { frame: bpy.path.abspath(scene.render.frame_path(frame=frame)) for frame in range(self.start, self.end+1) }
+        finally:
+            snapshot.restore(scene)
+
+    def apply(self, scene):
+        scene.camera = bpy.data.objects[self.cam]
+        scene.frame_start = self.start
+        scene.frame_end = self.end
+        scene.render.filepath = self.filepath
+        apply_render_settings(*self.render_settings)
+        for path,value in self.overrides:
+            set_value(scene, path, value)
+        apply_visibility(scene, self.visibility)
+
+
+def prepare_jobs(strips, path, separate_dir, default_render_settings, overrides=None, defaults=None, visibility=None):
+    """Resolve strips to jobs. Overrides of each strip are validated ones, defaults restore properties overridden by any strip"""
+    overrides = overrides or {}
+    visibility = visibility or {}
+    defaults = defaults or {}
+
+    def effective_overrides(name):
+        # overrides of strip in its order, then defaults of properties other strips override
+        values = dict(overrides.get(name, ()))
+        for path,value in defaults.items():
+            values.setdefault(path, value)
+        return order_overrides(values.items())
+
+    return deque(
+        StripJob(
+            name,
+            strip.cam,
+            strip.start,
+            strip.end,
+            strip_output_path(path, name, separate_dir),
+            get_strip_render_settings(strip) if strip.custom_render else default_render_settings,
+            effective_overrides(name),
+            visibility.get(name, ()),
+        )
+        for name,strip in strips.items()
+    )
+
+
+def prepare_scene_jobs(scene, strips, path, separate_dir):
+    """Validate overrides and visibility and resolve strips to jobs. Returns jobs and snapshot of scene state to restore"""
+    overrides = validate_overrides(scene, strips)
+    visibility, current = validate_visibility(scene, strips)
+    paths = list(dict.fromkeys(path for values in overrides.values() for path,_ in values))
+    snapshot = RenderSnapshot(scene, paths, [VisibilitySnapshot(current)] if current else [])
+    jobs = prepare_jobs(strips, path, separate_dir, get_render_settings(scene), overrides, snapshot.defaults(paths), visibility)
+    return jobs, snapshot
+
+
+def render_job(job, override=None):
+    """Render animation of job with blocking EXEC_DEFAULT, or INVOKE_DEFAULT in context override. Returns operator result"""
+    if override is None:
+        return bpy.ops.render.render("EXEC_DEFAULT", animation=True)
+    elif hasattr(bpy.context, "temp_override"):
+        with bpy.context.temp_override(**override):
+            return bpy.ops.render.render("INVOKE_DEFAULT", animation=True)
+    else:
+        return bpy.ops.render.render(override, "INVOKE_DEFAULT", animation=True)
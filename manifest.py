@@ -0,0 +1,111 @@
+import bpy
+import hashlib
+import json
+import os
+
+from .overrides import order_overrides
+
+MANIFEST_NAME = ".render_strip.json"
+
+
+def hash_blend():
+    """Hash of saved .blend file, unsaved changes are not included"""
+    if not bpy.data.filepath:
+        return ""
+    sha = hashlib.sha1()
+    with open(bpy.data.filepath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def fingerprint(scene, job, frame, blend_hash):
+    data = [job.cam, frame, list(job.render_settings), [[path, value] for path,value in sorted(job.overrides)], scene.render.image_settings.file_format, blend_hash]
+    if job.visibility:
+        # appended only when used, so fingerprints of unscoped strips stay valid
+        data.append([[kind, name, value] for (kind,name),value in job.visibility])
+    return hashlib.sha1(json.dumps(data).encode()).hexdigest()
+
+
+def load_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(directory, manifest):
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, MANIFEST_NAME)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+class IncrementalRender:
+    """Skip frames whose output exists and was rendered with same fingerprint.
+
+    Jobs are split around up to date frames, others render with overwrite
+    on, so stale outputs are replaced in place and kept if render is
+    cancelled.
+    """
+
+    def __init__(self, scene):
+        self.blend_hash = hash_blend()
+        # jobs turn overwrite on while they render
+        self.use_overwrite = scene.render.use_overwrite
+        self.manifests = {}
+        # (mtime, size) of stale outputs, recorded only once rendered again
+        self.stale = {}
+
+    def frames(self, scene, jobs):
+        for job in jobs:
+            for frame,path in job.frame_paths(scene).items():
+                directory, name = os.path.split(path)
+                if directory not in self.manifests:
+                    self.manifests[directory] = load_manifest(directory)
+                yield frame, self.manifests[directory], name, path, fingerprint(scene, job, frame, self.blend_hash)
+
+    def prepare(self, scene, jobs):
+        """Jobs rendering frames which aren't up to date, and number of up to date frames"""
+        if scene.render.is_movie_format:
+            raise Exception("Incremental render needs image output")
+        planned = []
+        skipped = 0
+        for job in jobs:
+            start = None
+            for frame,manifest,name,path,fp in self.frames(scene, [job]):
+                if os.path.exists(path):
+                    if manifest.get(name) == fp:
+                        skipped += 1
+                        if start is not None:
+                            planned.append(job.split(start, frame-1))
+                            start = None
+                        continue
+                    stat = os.stat(path)
+                    self.stale[path] = (stat.st_mtime_ns, stat.st_size)
+                if start is None:
+                    start = frame
+            if start is not None:
+                planned.append(job.split(start, job.end))
+        for job in planned:
+            job.overrides = order_overrides(dict(job.overrides, **{ "render.use_overwrite": True }).items())
+        return planned, skipped
+
+    def finish(self, scene, jobs):
+        """Record fingerprints of rendered frames"""
+        scene.render.use_overwrite = self.use_overwrite
+        changed = set()
+        for frame,manifest,name,path,fp in self.frames(scene, jobs):
+            if not os.path.exists(path) or manifest.get(name) == fp:
+                continue
+            if path in self.stale:
+                stat = os.stat(path)
+                if self.stale[path] == (stat.st_mtime_ns, stat.st_size):
+                    # not rendered again, e.g. cancelled
+                    continue
+            manifest[name] = fp
+            changed.add(os.path.dirname(path))
+        for directory in changed:
+            save_manifest(directory, self.manifests[directory])
@@ -0,0 +1,87 @@
+import bpy
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+
+class OutputOffload:
+    """Render into local scratch directory and move frames to output path in background threads"""
+
+    def __init__(self, root, scratch, threads, pending):
+        self.root = bpy.path.abspath(root)
+        base = os.path.abspath(bpy.path.abspath(scratch) or tempfile.gettempdir())
+        os.makedirs(base, exist_ok=True)
+        # directory of this render, renders running at once don't share frames
+        self.scratch = os.path.join(tempfile.mkdtemp(prefix="render_strip_staging_", dir=base), "")
+        self.pool = ThreadPoolExecutor(max_workers=threads)
+        # frames written but not moved yet, render is held back when all are taken
+        self.slots = threading.BoundedSemaphore(pending)
+        self.lock = threading.Lock()
+        self.futures = set()
+        self.moved = 0
+        self.failed = {}
+
+    def stage(self, scene, jobs):
+        """Jobs rendering into scratch directory instead of output path"""
+        staged = []
+        for job in jobs:
+            filepath = bpy.path.abspath(job.filepath)
+            if not filepath.startswith(self.root):
+                raise Exception("Output of {} is outside output path".format(job.name))
+            paths = job.frame_paths(scene)
+            start = None
+            for frame in range(job.start, job.end+1):
+                # without overwrite blender skips frames existing in scratch, not at destination
+                if not job.overwrite(scene) and os.path.exists(paths[frame]):
+                    if start is not None:
+                        staged.append(job.split(start, frame-1))
+                        start = None
+                    continue
+                if start is None:
+                    start = frame
+            if start is not None:
+                staged.append(job.split(start, job.end))
+        for job in staged:
+            job.filepath = self.scratch + bpy.path.abspath(job.filepath)[len(self.root):]
+        return staged
+
+    def _move(self, source, destination):
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        partial = destination + ".part"
+        shutil.copyfile(source, partial)
+        os.replace(partial, destination)
+        os.remove(source)
+
+    def _done(self, future, destination, callback):
+        self.slots.release()
+        with self.lock:
+            self.futures.discard(future)
+            error = future.exception()
+            if error is None:
+                self.moved += 1
+            else:
+                self.failed[destination] = str(error)
+        if error is None and callback is not None:
+            callback()
+
+    def submit(self, source, callback=None):
+        """Move frame written into scratch directory to its destination, callback is called once moved"""
+        destination = self.root + source[len(self.scratch):]
+        self.slots.acquire()
+        future = self.pool.submit(self._move, source, destination)
+        with self.lock:
+            self.futures.add(future)
+        future.add_done_callback(lambda future: self._done(future, destination, callback))
+
+    def wait(self):
+        with self.lock:
+            futures = list(self.futures)
+        wait(futures)
+
+    def close(self):
+        """Wait for all transfers and remove scratch directory. Returns {destination: error} of failed frames"""
+        self.pool.shutdown(wait=True)
+        shutil.rmtree(self.scratch, ignore_errors=True)
+        return self.failed
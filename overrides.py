@@ -0,0 +1,153 @@
+# scene state changed while rendering strips
+STATE_PATHS = (
+    "camera",
+    "frame_start",
+    "frame_end",
+    "render.filepath",
+    "render.engine",
+    "render.resolution_x",
+    "render.resolution_y",
+    "render.resolution_percentage",
+    "render.pixel_aspect_x",
+    "render.pixel_aspect_y",
+)
+
+# properties limiting values of others, e.g. color depths of file format, are set first
+LEADING_PATHS = (
+    "render.engine",
+    "render.image_settings.file_format",
+)
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+FALSE_VALUES = ("0", "false", "no", "off")
+
+
+def resolve(scene, path):
+    """Returns owner struct, property name and property definition of RNA path relative to scene"""
+    owner_path, _, name = path.rpartition(".")
+    try:
+        owner = scene.path_resolve(owner_path) if owner_path else scene
+    except ValueError:
+        owner = None
+    prop = owner.bl_rna.properties.get(name) if owner is not None and hasattr(owner, "bl_rna") else None
+    if prop is None:
+        raise Exception("Unknown property: {}".format(path))
+    if prop.is_readonly:
+        raise Exception("Read-only property: {}".format(path))
+    return owner, name, prop
+
+
+def parse_value(prop, text):
+    text = text.strip()
+    if getattr(prop, "is_array", False) and prop.array_length > 0:
+        items = [item for item in text.replace(",", " ").split()]
+        if len(items) != prop.array_length:
+            raise Exception("{} expects {} values".format(prop.identifier, prop.array_length))
+        return tuple(parse_item(prop, item) for item in items)
+    return parse_item(prop, text)
+
+
+def parse_item(prop, text):
+    if prop.type == "BOOLEAN":
+        if text.lower() in TRUE_VALUES:
+            return True
+        if text.lower() in FALSE_VALUES:
+            return False
+        raise Exception("{} expects true or false".format(prop.identifier))
+    if prop.type in ("INT", "FLOAT"):
+        try:
+            value = int(text) if prop.type == "INT" else float(text)
+        except ValueError:
+            raise Exception("{} expects a number".format(prop.identifier))
+        if not prop.hard_min <= value <= prop.hard_max:
+            raise Exception("{} expects value in {}..{}".format(prop.identifier, prop.hard_min, prop.hard_max))
+        return value
+    if prop.type == "ENUM":
+        # items of dynamic enums aren't known without context
+        items = prop.enum_items.keys()
+        if items and text not in items:
+            raise Exception("{} expects one of {}".format(prop.identifier, ", ".join(items)))
+        return text
+    if prop.type == "STRING":
+        return text
+    raise Exception("{} properties can't be overridden".format(prop.type.lower()))
+
+
+def format_value(value):
+    if isinstance(value, tuple):
+        return " ".join(format_value(item) for item in value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def get_value(scene, path):
+    owner, name, prop = resolve(scene, path)
+    value = getattr(owner, name)
+    if getattr(prop, "is_array", False) and prop.array_length > 0:
+        return tuple(value)
+    return value
+
+
+def set_value(scene, path, value):
+    """Write value if it differs from current one. Returns whether it was written"""
+    owner, name, prop = resolve(scene, path)
+    current = getattr(owner, name)
+    if getattr(prop, "is_array", False) and prop.array_length > 0:
+        current = tuple(current)
+    if current == value or (prop.type == "FLOAT" and not isinstance(value, tuple) and abs(current - value) < 1e-6):
+        return False
+    setattr(owner, name, value)
+    return True
+
+
+def path_order(path):
+    return LEADING_PATHS.index(path) if path in LEADING_PATHS else len(LEADING_PATHS)
+
+
+def order_overrides(items):
+    """Overrides in given order, with properties others depend on first"""
+    return tuple(sorted(items, key=lambda item: path_order(item[0])))
+
+
+def validate_overrides(scene, strips):
+    """Parse overrides of strips with custom render settings. Returns {strip name: ((path, value), ...)}"""
+    overrides = {}
+    for name,strip in strips.items():
+        if not strip.custom_render:
+            continue
+        parsed = {}
+        for override in strip.overrides:
+            try:
+                _, _, prop = resolve(scene, override.path)
+                parsed[override.path] = parse_value(prop, override.value)
+            except Exception as e:
+                raise Exception("Strip {}: {}".format(name, e))
+        if parsed:
+            overrides[name] = order_overrides(parsed.items())
+    return overrides
+
+
+class RenderSnapshot:
+    """Scene state to restore once strips are rendered"""
+
+    def __init__(self, scene, paths=(), states=()):
+        self.values = { path: get_value(scene, path) for path in sorted(dict.fromkeys(STATE_PATHS + tuple(paths)), key=path_order) }
+        # other state restored along, e.g. visibility of collections
+        self.states = states
+
+    def defaults(self, paths):
+        return { path: self.values[path] for path in paths }
+
+    def restore(self, scene):
+        """Restore every value, failures are raised once the rest was restored"""
+        errors = []
+        for path,value in self.values.items():
+            try:
+                set_value(scene, path, value)
+            except Exception as e:
+                errors.append("{}: {}".format(path, e))
+        for state in self.states:
+            state.restore(scene)
+        if errors:
+            raise Exception("Restoring scene failed, {}".format("; ".join(errors)))
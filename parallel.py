@@ -0,0 +1,316 @@
+import bpy
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+
+from .batch import DONE_PREFIX, EXIT_OK
+from .jobs import prepare_scene_jobs
+from .manifest import IncrementalRender
+from .planner import plan_duplicates, link_outputs, order_jobs
+from .static import plan_static_frames
+from .tiles import TileScheduler
+from .utils import validate_strips, ShowMessageBox
+
+WORKER_EXPR = "import bpy; bpy.ops.render.renderstrip_batch(use_argv=True)"
+SAVED_PREFIX = "Saved:"
+
+# progress of running parallel render, drawn in panel
+progress = None
+
+
+def worker_threads(threads, workers):
+    """Render threads of each worker, processors are shared evenly when threads is 0"""
+    if threads > 0:
+        return threads
+    return max(1, (os.cpu_count() or 1) // max(workers, 1))
+
+
+class Worker:
+    """Background blender process rendering strips sent on its stdin"""
+
+    def __init__(self, args, messages):
+        self.job = None
+        self.process = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True, bufsize=1)
+        self.thread = threading.Thread(target=self._read, args=(messages,), daemon=True)
+        self.thread.start()
+
+    def _read(self, messages):
+        for line in self.process.stdout:
+            messages.put((self, line.rstrip("\n")))
+        messages.put((self, None))
+
+    def send(self, job):
+        self.job = job
+        self.process.stdin.write(job + "\n")
+        self.process.stdin.flush()
+
+    def close(self):
+        self.job = None
+        if not self.process.stdin.closed:
+            self.process.stdin.close()
+
+    def kill(self):
+        if self.process.poll() is None:
+            self.process.terminate()
+
+
+class ChunkScheduler:
+    """Hand out frame ranges of jobs, sized by measured cost per frame.
+
+    First chunk of a strip has chunk_frames frames, later ones as many as
+    render in chunk_seconds at its measured cost. No chunk is bigger than
+    half of remaining frames per worker, so chunks shrink towards the end.
+    Without split each job is handed out whole.
+    """
+
+    def __init__(self, jobs, workers, split, chunk_frames, chunk_seconds):
+        # [name, next frame, end frame] of jobs with frames left to hand out
+        self.remaining = deque([job.name, job.start, job.end] for job in jobs)
+        self.workers = workers
+        self.split = split
+        self.chunk_frames = chunk_frames
+        self.chunk_seconds = chunk_seconds
+        # seconds per frame, measured from finished chunks
+        self.cost = {}
+        self.outstanding = { job.name: 0 for job in jobs }
+        self.started = {}
+
+    def remaining_frames(self):
+        return sum(end - start + 1 for _,start,end in self.remaining)
+
+    def pending_strips(self):
+        """Names of strips with frames to render"""
+        return set(self.outstanding)
+
+    def chunk_size(self, name):
+        if name in self.cost:
+            size = int(self.chunk_seconds / max(self.cost[name], 1e-6))
+        else:
+            size = self.chunk_frames
+        # guided scheduling: shrink chunks towards the end so workers finish together
+        size = min(size, -(-self.remaining_frames() // (2 * self.workers)))
+        return max(size, 1)
+
+    def next_job(self):
+        if not self.remaining:
+            return None
+        entry = self.remaining[0]
+        name, start, end = entry
+        if self.split:
+            end = min(end, start + self.chunk_size(name) - 1)
+        if end == entry[2]:
+            self.remaining.popleft()
+        else:
+            entry[1] = end + 1
+        self.outstanding[name] += 1
+        job = "{}\t{}\t{}".format(name, start, end)
+        self.started[job] = time.perf_counter()
+        return job
+
+    def finish_job(self, job):
+        """Record cost of finished job. Returns strip name if it was its last chunk"""
+        elapsed = time.perf_counter() - self.started.pop(job)
+        name, start, end = job.split("\t")
+        cost = elapsed / (int(end) - int(start) + 1)
+        self.cost[name] = cost if name not in self.cost else 0.5 * (self.cost[name] + cost)
+        self.outstanding[name] -= 1
+        if self.outstanding[name] == 0 and not any(entry[0] == name for entry in self.remaining):
+            return name
+        return None
+
+
+class RenderProgress:
+    def __init__(self, total_strips, total, workers, unit="frames"):
+        self.total_strips = total_strips
+        # frames, or tiles in tiled mode, counted as workers save them
+        self.total = total
+        self.unit = unit
+        self.workers = workers
+        self.done_strips = 0
+        self.done = 0
+        self.failed = []
+        self.cancel = False
+
+    def text(self):
+        return "{}/{} {}, {}/{} strips, {} workers".format(self.done, self.total, self.unit, self.done_strips, self.total_strips, self.workers)
+
+
+class RenderStripParallelOperator(bpy.types.Operator):
+    """Render strips in parallel background blender processes, whole frames or tiles of each frame"""
+    bl_idname = "render.renderstrip_parallel"
+    bl_label = "Render Strip (Parallel)"
+
+    _timer = None
+    tmpdir = None
+    scheduler = None
+    jobs = None
+    planned = None
+    links = None
+    incremental = None
+    workers = None
+    messages = None
+
+    def execute(self, context):
+        global progress
+        if progress is not None:
+            ShowMessageBox(icon="ERROR", message="Parallel render already running")
+            return {"CANCELLED"}
+        try:
+            scene = context.scene
+            settings = scene.rs_settings
+            active_strips = [strip for strip in settings.strips if strip.enabled]
+            strips = validate_strips(scene, active_strips)
+            path = bpy.path.abspath(scene.render.filepath)
+            # overrides are validated here, workers apply them from saved copy
+            self.jobs, _ = prepare_scene_jobs(scene, strips, path, settings.separate_dir)
+            self.jobs = order_jobs(self.jobs, settings.order, { name: strip.frame_estimate for name,strip in strips.items() }, scene.render.engine)
+            self.links = []
+            if settings.deduplicate:
+                self.jobs, self.links = plan_duplicates(scene, self.jobs)
+            if settings.skip_static:
+                self.jobs, static_links = plan_static_frames(scene, self.jobs)
+                # static frames may be sources of duplicates
+                self.links = static_links + self.links
+            if settings.incremental:
+                # up to date frames aren't handed out to workers
+                self.incremental = IncrementalRender(scene)
+                # manifests record planned jobs, not split jobs overwriting stale frames
+                self.planned = list(self.jobs)
+                self.jobs, _ = self.incremental.prepare(scene, self.jobs)
+
+            tiled = settings.render_mode == "TILED"
+            if tiled and scene.render.is_movie_format:
+                raise Exception("Tiled render needs image output")
+
+            # workers render a copy, so unsaved changes are included
+            self.tmpdir = tempfile.mkdtemp(prefix="render_strip_")
+            blend = os.path.join(self.tmpdir, "render_strip.blend")
+            use_overwrite = scene.render.use_overwrite
+            if self.incremental is not None:
+                # workers replace stale frames, jobs resolved from copy don't carry overwrite of split jobs
+                scene.render.use_overwrite = True
+            try:
+                bpy.ops.wm.save_as_mainfile(filepath=blend, copy=True)
+            finally:
+                scene.render.use_overwrite = use_overwrite
+            # workers write tiles next to blend copy
+            output = self.tmpdir if tiled else path
+
+            # movie outputs are named after frame range, so can't be split
+            split = tiled or (settings.split_strips and not scene.render.is_movie_format)
+            if tiled:
+                self.scheduler = TileScheduler(scene, self.jobs, settings.tiles_x, settings.tiles_y, settings.tile_overlap, self.tmpdir)
+            else:
+                self.scheduler = ChunkScheduler(self.jobs, settings.workers, split, settings.chunk_frames, settings.chunk_seconds)
+            total = self.scheduler.remaining_tiles() if tiled else self.scheduler.remaining_frames()
+            workers = min(settings.workers, total if split else len(self.jobs))
+            args = [
+                bpy.app.binary_path, "-b", blend,
+                "--addons", __package__,
+                "-t", str(worker_threads(settings.threads_per_worker, workers)),
+                "--python-expr", WORKER_EXPR,
+                "--", "--worker",
+                "--output", output,
+                "--separate-dir" if settings.separate_dir else "--no-separate-dir",
+            ]
+            self.messages = queue.Queue()
+            self.workers = [Worker(args, self.messages) for _ in range(workers)]
+            for worker in self.workers:
+                worker.send(self.scheduler.next_job())
+
+            progress = RenderProgress(len(strips), total, len(self.workers), "tiles" if tiled else "frames")
+            # strips with every frame skipped are done already
+            progress.done_strips = len(strips) - len(self.scheduler.pending_strips())
+            context.window_manager.progress_begin(0, progress.total)
+            self._timer = context.window_manager.event_timer_add(0.5, window=context.window)
+            context.window_manager.modal_handler_add(self)
+            return {"RUNNING_MODAL"}
+        except Exception as e:
+            self.cleanup(context)
+            ShowMessageBox(icon="ERROR", message=str(e))
+            return {"CANCELLED"}
+
+    def handle(self, worker, line):
+        if line is None:
+            # worker exited
+            if worker.job is not None:
+                progress.failed.append(worker.job.replace("\t", " "))
+                worker.job = None
+            self.workers.remove(worker)
+        elif line.startswith(SAVED_PREFIX):
+            progress.done += 1
+        elif line.startswith(DONE_PREFIX):
+            status, job = line[len(DONE_PREFIX):].split("\t", 1)
+            try:
+                if self.scheduler.finish_job(job) is not None:
+                    progress.done_strips += 1
+            except Exception as e:
+                # tiles of frame couldn't be stitched
+                progress.failed.append(str(e))
+            if int(status) != EXIT_OK:
+                progress.failed.append(job.replace("\t", " "))
+            job = None if progress.cancel else self.scheduler.next_job()
+            if job is not None:
+                worker.send(job)
+            else:
+                worker.close()
+
+    def modal(self, context, event):
+        if event.type == 'TIMER':
+            if progress.cancel:
+                for worker in self.workers:
+                    worker.kill()
+            while not self.messages.empty():
+                self.handle(*self.messages.get())
+            context.window_manager.progress_update(progress.done)
+            for area in context.screen.areas:
+                if area.type == 'PROPERTIES':
+                    area.tag_redraw()
+
+            if not self.workers:
+                # strips never picked up by a worker
+                if not progress.cancel:
+                    progress.failed.extend(dict.fromkeys(entry[0] for entry in self.scheduler.remaining))
+                linked = link_outputs(self.links)
+                if progress.cancel:
+                    self.report({"WARNING"}, "Render cancelled")
+                elif progress.failed:
+                    self.report({"ERROR"}, "Failed strips: {}".format(", ".join(progress.failed)))
+                else:
+                    self.report({"INFO"}, "Rendered {} strips, {} frames linked".format(progress.done_strips, linked))
+                context.window_manager.event_timer_remove(self._timer)
+                context.window_manager.progress_end()
+                self.cleanup(context)
+                return {"FINISHED"}
+
+        return {"PASS_THROUGH"}
+
+    def cleanup(self, context):
+        global progress
+        progress = None
+        if self.incremental is not None:
+            self.incremental.finish(context.scene, self.planned)
+            self.incremental = None
+        for worker in self.workers or []:
+            worker.kill()
+        if self.tmpdir is not None:
+            shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+
+class OBJECT_OT_CancelParallelRender(bpy.types.Operator):
+    """Stop all workers of running parallel render"""
+    bl_idname = "rs.cancelparallelrender"
+    bl_label = "Cancel Parallel Render"
+
+    @classmethod
+    def poll(cls, context):
+        return progress is not None
+
+    def execute(self, context):
+        progress.cancel = True
+        return {'FINISHED'}
@@ -0,0 +1,167 @@
+import bpy
+
+from .encode import EncodeStage, find_ffmpeg
+from .manifest import IncrementalRender
+from .offload import OutputOffload
+from .planner import plan_duplicates, link_outputs
+from .static import plan_static_frames
+
+
+class RenderOptions:
+    """Optional stages of a render"""
+
+    def __init__(self, **options):
+        self.frames = None
+        self.incremental = False
+        self.deduplicate = False
+        self.skip_static = False
+        self.encode = False
+        self.staging = False
+        self.report = False
+        for name,value in options.items():
+            if not hasattr(self, name):
+                raise TypeError("Unknown render option: {}".format(name))
+            setattr(self, name, value)
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(
+            incremental=settings.incremental,
+            deduplicate=settings.deduplicate,
+            skip_static=settings.skip_static,
+            encode=settings.encode,
+            staging=settings.staging,
+            report=settings.telemetry,
+        )
+
+    @classmethod
+    def from_args(cls, args):
+        return cls(
+            frames=args.frames,
+            incremental=args.incremental,
+            deduplicate=args.deduplicate,
+            skip_static=args.skip_static,
+            encode=args.encode,
+            staging=args.staging,
+            report=args.report,
+        )
+
+
+class RenderPipeline:
+    """Optional stages around rendering of jobs, shared by interactive and batch renders.
+
+    plan turns ordered jobs of strips into jobs to render, start_job and
+    job_done are called around rendering of each of them and finish is
+    called once, after scene state was restored.
+    """
+
+    def __init__(self, options, log=print):
+        self.options = options
+        # summary lines, shown in report or printed
+        self.log = log
+        self.strip_jobs = []
+        self.planned = []
+        self.links = []
+        self.incremental = None
+        self.offload = None
+        self.encode = None
+        self.current = None
+        self.handler = False
+
+    def plan(self, scene, jobs, path):
+        """Jobs to render for ordered jobs of strips rendered into path"""
+        settings = scene.rs_settings
+        options = self.options
+        # resolved first, so nothing is changed when it is missing
+        ffmpeg = find_ffmpeg(settings.ffmpeg_path) if options.encode else None
+        self.strip_jobs = list(jobs)
+        jobs = list(jobs)
+        if options.deduplicate:
+            jobs, self.links = plan_duplicates(scene, jobs)
+            self.log("{} renders saved by deduplication".format(len(self.links)))
+        if options.skip_static:
+            jobs, static_links = plan_static_frames(scene, jobs)
+            # static frames may be sources of duplicates
+            self.links = static_links + self.links
+            self.log("{} static frames reused".format(len(static_links)))
+        self.planned = list(jobs)
+        if options.incremental:
+            self.incremental = IncrementalRender(scene)
+            jobs, skipped = self.incremental.prepare(scene, jobs)
+            self.log("{} frames up to date".format(skipped))
+        try:
+            if options.staging:
+                self.offload = OutputOffload(path, settings.staging_dir, settings.offload_threads, settings.offload_pending)
+                jobs = self.offload.stage(scene, jobs)
+            if options.encode:
+                self.encode = EncodeStage(scene, self.strip_jobs, jobs, self.links, ffmpeg, settings.encode_args, settings.encode_queue)
+        except Exception:
+            self.abort()
+            raise
+        return jobs
+
+    def abort(self):
+        """Stop background stages of a render which didn't start"""
+        if self.handler:
+            bpy.app.handlers.render_write.remove(self._write)
+            self.handler = False
+        if self.offload is not None:
+            self.offload.close()
+            self.offload = None
+        self.encode = None
+
+    def _write(self, scene, depsgraph=None):
+        name = self.current
+        frame = scene.frame_current
+        if self.offload is None:
+            self.encode.frame_written(name, frame)
+            return
+        callback = None if self.encode is None else lambda: self.encode.frame_written(name, frame)
+        self.offload.submit(bpy.path.abspath(scene.render.frame_path(frame=frame)), callback)
+
+    def start(self):
+        """Start handing written frames to staging and encoding"""
+        if self.encode is not None or self.offload is not None:
+            bpy.app.handlers.render_write.append(self._write)
+            self.handler = True
+
+    def start_job(self, job):
+        self.current = job.name
+        if self.encode is not None:
+            self.encode.start(job.name)
+
+    def job_done(self, job):
+        if self.encode is not None:
+            if self.offload is not None:
+                # encoder needs all frames of strip at destination
+                self.offload.wait()
+            self.encode.job_done(job.name)
+
+    def finish(self, scene):
+        """Wait for background stages, record and link outputs. Returns names of strips which failed"""
+        failed = []
+        if self.handler:
+            bpy.app.handlers.render_write.remove(self._write)
+            self.handler = False
+        if self.offload is not None:
+            failed_moves = self.offload.close()
+            for destination,error in failed_moves.items():
+                print("Render Strip: moving {} failed: {}".format(destination, error))
+            if failed_moves:
+                self.log("{} frames failed to move to output, see console".format(len(failed_moves)))
+            for job in self.strip_jobs:
+                if job.name not in failed and any(path in failed_moves for path in job.frame_paths(scene).values()):
+                    failed.append(job.name)
+        if self.incremental is not None:
+            self.incremental.finish(scene, self.planned)
+        if self.encode is not None:
+            failed_videos = self.encode.close()
+        link_outputs(self.links)
+        if self.encode is not None:
+            for name,error in failed_videos.items():
+                self.log("{} video failed: {}".format(name, error))
+                if name not in failed:
+                    failed.append(name)
+            if not scene.rs_settings.keep_frames:
+                self.encode.remove_frames(failed_videos)
+        return failed
@@ -0,0 +1,164 @@
+import bpy
+import os
+import shutil
+import time
+
+from .overrides import order_overrides, resolve
+from .utils import strip_output_path
+
+# sample count property of each engine, lowered for drafts
+DRAFT_SAMPLE_PATHS = {
+    "CYCLES": "cycles.samples",
+    "BLENDER_EEVEE": "eevee.taa_render_samples",
+    # EEVEE of blender 4.2 to 4.x, settings shared with legacy EEVEE
+    "BLENDER_EEVEE_NEXT": "eevee.taa_render_samples",
+}
+
+
+def plan_duplicates(scene, jobs):
+    """Render frames shared by strips with same camera and render settings only once.
+
+    Jobs are split around frames already covered by an earlier job. Returns
+    jobs to render and (source, destination) outputs to link once rendered.
+    """
+    if scene.render.is_movie_format:
+        return list(jobs), []
+    owners = {}
+    planned = []
+    links = []
+    for job in jobs:
+        paths = job.frame_paths(scene)
+        start = None
+        for frame in range(job.start, job.end+1):
+            key = (job.cam, job.settings_key(), frame)
+            if key in owners:
+                links.append((owners[key], paths[frame]))
+                if start is not None:
+                    planned.append(job.split(start, frame-1))
+                    start = None
+            else:
+                owners[key] = paths[frame]
+                if start is None:
+                    start = frame
+        if start is not None:
+            planned.append(job.split(start, job.end))
+    return planned, links
+
+
+def link_outputs(links):
+    """Hardlink, or copy where not supported, rendered outputs. Returns number of linked frames"""
+    linked = 0
+    for source,destination in links:
+        if not os.path.exists(source):
+            continue
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        if os.path.lexists(destination):
+            os.remove(destination)
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copy2(source, destination)
+        linked += 1
+    return linked
+
+
+def sample_frames(job, count):
+    if count <= 1 or job.start == job.end:
+        return [(job.start + job.end) // 2]
+    step = (job.end - job.start) / (count - 1)
+    return sorted(set(round(job.start + i * step) for i in range(count)))
+
+
+def render_sample(scene, frame, percentage):
+    scene.frame_set(frame)
+    scene.render.resolution_percentage = percentage
+    started = time.perf_counter()
+    bpy.ops.render.render("EXEC_DEFAULT", write_still=False)
+    return time.perf_counter() - started
+
+
+def estimate_frame_seconds(scene, job, count, percentage):
+    """Estimate seconds per frame of job at full resolution from low resolution samples.
+
+    Each sample is rendered at percentage and half of it, and fitted to
+    seconds = overhead + pixels * seconds per pixel, so fixed per frame cost
+    isn't scaled with resolution.
+    """
+    job.apply(scene)
+    full = scene.render.resolution_percentage
+    high = max(1, full * percentage // 100)
+    low = max(1, high // 2)
+    # first render pays engine startup
+    render_sample(scene, job.start, low)
+    estimates = []
+    for frame in sample_frames(job, count):
+        high_seconds = render_sample(scene, frame, high)
+        low_seconds = render_sample(scene, frame, low)
+        if high == low:
+            estimates.append(high_seconds * (full / high) ** 2)
+            continue
+        per_pixel = max(0, (high_seconds - low_seconds) / (high ** 2 - low ** 2))
+        overhead = max(0, high_seconds - per_pixel * high ** 2)
+        estimates.append(overhead + per_pixel * full ** 2)
+    return sorted(estimates)[len(estimates) // 2]
+
+
+def job_cost(job, frame_seconds):
+    return frame_seconds.get(job.name, 0) * (job.end - job.start + 1)
+
+
+def order_jobs(jobs, policy, frame_seconds, current_engine=None):
+    """Order jobs by policy: LIST, SHORTEST, LONGEST or GROUPED by engine and resolution"""
+    jobs = list(jobs)
+    # strips without estimate cost as much per frame as the average strip
+    known = [seconds for seconds in frame_seconds.values() if seconds > 0]
+    average = sum(known) / len(known) if known else 1
+    frame_seconds = { job.name: frame_seconds.get(job.name) or average for job in jobs }
+    if policy == "SHORTEST":
+        jobs.sort(key=lambda job: job_cost(job, frame_seconds))
+    elif policy == "LONGEST":
+        jobs.sort(key=lambda job: -job_cost(job, frame_seconds))
+    elif policy == "GROUPED":
+        # each engine is started once, current engine first, then
+        # strips with same resolution follow each other
+        engines = {}
+        for job in jobs:
+            engines.setdefault(job.engine(), {}).setdefault(job.render_settings[1:4], []).append(job)
+        order = sorted(engines, key=lambda engine: engine != current_engine)
+        jobs = [job for engine in order for group in engines[engine].values() for job in group]
+    return jobs
+
+
+def plan_drafts(scene, jobs, path, separate_dir, percentage, samples, step):
+    """Fast draft of each job into draft directory under path: lower resolution and samples, every step-th frame.
+
+    Returns draft jobs and data paths they override, to reset before finals.
+    """
+    drafts = []
+    paths = set()
+    for job in jobs:
+        overrides = dict(job.overrides)
+        full = overrides.get("render.resolution_percentage", job.render_settings[3])
+        overrides["render.resolution_percentage"] = max(1, full * percentage // 100)
+        overrides["frame_step"] = step
+        # drafts of an earlier run are stale
+        overrides["render.use_overwrite"] = True
+        sample_path = DRAFT_SAMPLE_PATHS.get(job.engine())
+        if sample_path is not None:
+            try:
+                resolve(scene, sample_path)
+                overrides[sample_path] = samples
+            except Exception:
+                # engine addon not enabled
+                pass
+        draft = job.split(job.start, job.end)
+        draft.filepath = strip_output_path(path, job.name, separate_dir)
+        draft.overrides = order_overrides(overrides.items())
+        paths.update(overrides)
+        drafts.append(draft)
+    return drafts, sorted(paths)
+
+
+def order_flagged(jobs, flagged):
+    """Jobs of flagged strips first, in order they were flagged, others keep their order"""
+    return sorted(jobs, key=lambda job: (job.name not in flagged, flagged.get(job.name, 0)))
@@ -1,9 +1,20 @@
 import bpy
 import os
-from collections import OrderedDict
-import re
+import time
+from collections import deque
 
-from .utils import apply_render_settings, copy_render_settings, get_available_render_engines, get_available_render_engines_values, ShowMessageBox
+from bpy_extras.io_utils import ExportHelper, ImportHelper
+
+from . import indexes, parallel, strip_io
+from .jobs import prepare_scene_jobs, render_job
+from .overrides import RenderSnapshot, format_value, get_value, set_value, validate_overrides
+from .pipeline import RenderOptions, RenderPipeline
+from .planner import order_jobs, estimate_frame_seconds, plan_drafts, order_flagged
+from .telemetry import RenderTelemetry
+from .utils import apply_render_settings, copy_render_settings, validate_strips, format_duration, ShowMessageBox
+
+# tries to start render of a strip, 10ms apart, while previous render isn't released
+DISPATCH_RETRIES = 500
 
 
 class RenderStripOperator(bpy.types.Operator):
@@ -12,112 +23,191 @@ class RenderStripOperator(bpy.types.Operator):
     bl_label = "Render Strip"
 
     _timer = None
-    strips = None
+    _window = None
+    jobs = None
+    pipeline = None
+    telemetry = None
+    # final jobs waiting for draft pass, None when rendering finals
+    final_jobs = None
+    draft_snapshot = None
+    # job applied to scene and handed to render
+    dispatched = None
+    retries = None
     stop = None
-    rendering = None
+    done = None
+    error = None
+    summary = None
+
+    # inter-strip idle time
+    completed_at = None
+    idle_times = None
 
-    # help revert to original
-    camera = None
-    frame_start = None
-    frame_end = None
     path = None
-    render_engine = None
-    resolution_x = None
-    resolution_y = None
-    resolution_percentage = None
-    pixel_aspect_x = None
-    pixel_aspect_y = None
+    # help revert to original
+    snapshot = None
 
     def _init(self, dummy, thrd = None):
-        self.rendering = True
+        if self.completed_at is not None:
+            self.idle_times.append(time.perf_counter() - self.completed_at)
 
     def _complete(self, dummy, thrd = None):
-        self.strips.popitem(last=False)
-        self.rendering = False
+        self.completed_at = time.perf_counter()
+        if self.final_jobs is None:
+            # drafts aren't encoded or staged
+            self.pipeline.job_done(self.jobs[0])
+        self.jobs.popleft()
+        # start next strip as soon as blender is back in main loop
+        bpy.app.timers.register(self._dispatch, first_interval=0)
 
     def _cancel(self, dummy, thrd = None):
         self.stop = True
+        bpy.app.timers.register(self._dispatch, first_interval=0)
 
     def execute(self, context):
         try:
             self.stop = False
-            self.rendering = False
+            self.done = False
+            self.error = None
+            self.dispatched = None
+            self.retries = 0
+            self.completed_at = None
+            self.idle_times = []
+            self.summary = []
+            self.telemetry = RenderTelemetry()
+            self.pipeline = None
             scene = bpy.context.scene
-            active_strips = [strip for strip in scene.rs_settings.strips if strip.enabled]
-            if any(strip.cam not in scene.objects or scene.objects[strip.cam].type != "CAMERA" for strip in active_strips):
-                raise Exception("Invalid Camera in strips!")
-            if not all(strip.name for strip in active_strips):
-                raise Exception("Invalid Name in strips!")
-            self.strips = OrderedDict({
-                strip.name: strip
-                for strip in active_strips
-            })
-
-            if len(self.strips) == 0:
-                raise Exception("No active strip")
-            if len(self.strips)<len(active_strips):
-                raise Exception("Multiple strip with same name found. Please use unique name")
-            self.camera = scene.camera
-            self.frame_start = scene.frame_start
-            self.frame_end = scene.frame_end
-            self.path = scene.render.filepath
-            self.render_engine = scene.render.engine
-            self.resolution_x = scene.render.resolution_x
-            self.resolution_y = scene.render.resolution_y
-            self.resolution_percentage = scene.render.resolution_percentage
-            self.pixel_aspect_x = scene.render.pixel_aspect_x
-            self.pixel_aspect_y = scene.render.pixel_aspect_y
+            settings = scene.rs_settings
+            with self.telemetry.measure("prepare"):
+                active_strips = [strip for strip in settings.strips if strip.enabled]
+                strips = validate_strips(scene, active_strips)
+                self.path = scene.render.filepath
+                jobs, self.snapshot = prepare_scene_jobs(scene, strips, self.path, settings.separate_dir)
+                jobs = order_jobs(jobs, settings.order, { name: strip.frame_estimate for name,strip in strips.items() }, scene.render.engine)
+                self.pipeline = RenderPipeline(RenderOptions.from_settings(settings), self.summary.append)
+                self.jobs = deque(self.pipeline.plan(scene, jobs, self.path))
+                self.final_jobs = None
+                if settings.draft_pass:
+                    draft_path = os.path.join(os.path.dirname(self.path), settings.draft_dir, os.path.basename(self.path))
+                    drafts, paths = plan_drafts(scene, jobs, draft_path, settings.separate_dir, settings.draft_resolution, settings.draft_samples, settings.draft_step)
+                    self.draft_snapshot = RenderSnapshot(scene, paths)
+                    self.final_jobs = self.jobs
+                    self.jobs = deque(drafts)
+                else:
+                    self.pipeline.start()
+            if settings.telemetry:
+                self.telemetry.start()
 
             bpy.app.handlers.render_init.append(self._init)
             bpy.app.handlers.render_complete.append(self._complete)
             bpy.app.handlers.render_cancel.append(self._cancel)
 
-            self._timer = bpy.context.window_manager.event_timer_add(0.5, window=bpy.context.window)
+            self._window = bpy.context.window
+            # only used to close the operator, strips are dispatched from render handlers
+            self._timer = bpy.context.window_manager.event_timer_add(0.5, window=self._window)
             bpy.context.window_manager.modal_handler_add(self)
 
+            bpy.app.timers.register(self._dispatch, first_interval=0)
             return {"RUNNING_MODAL"}
         except Exception as e:
+            if self.pipeline is not None:
+                self.pipeline.abort()
             ShowMessageBox(icon="ERROR", message=str(e))
             return {"CANCELLED"}
 
-    def apply_default_render_settings(self):
-        apply_render_settings(self.render_engine,self.resolution_x,self.resolution_y,self.resolution_percentage,self.pixel_aspect_x,self.pixel_aspect_y)
-
-    def apply_strip_render_settings(self, strip):
-        apply_render_settings(strip.render_engine,strip.resolution_x,strip.resolution_y,strip.resolution_percentage,strip.pixel_aspect_x,strip.pixel_aspect_y)
+    def _dispatch(self):
+        if self.done:
+            return None
+        # render_complete is called before render job is released
+        if hasattr(bpy.app, "is_job_running") and bpy.app.is_job_running("RENDER"):
+            return 0.001
+        try:
+            if not self.stop and not self.jobs and self.final_jobs is not None:
+                self.start_finals(bpy.context.scene)
+            if self.stop or not self.jobs:
+                self.finish()
+                return None
+            job = self.jobs[0]
+            if self.dispatched is not job:
+                with self.telemetry.switch(job.name):
+                    job.apply(bpy.context.scene)
+                if self.final_jobs is None:
+                    self.pipeline.start_job(job)
+                self.dispatched = job
+            result = render_job(job, {"window": self._window, "screen": self._window.screen})
+        except Exception as e:
+            # timer is gone once it raises, nothing would finish the operator
+            print("Render Strip: {}".format(e))
+            self.error = str(e)
+            self.stop = True
+            if not self.done:
+                self.finish()
+            return None
+        if result == {"CANCELLED"}:
+            if not hasattr(bpy.app, "is_job_running") and self.retries < DISPATCH_RETRIES:
+                # render of previous strip not released yet, blender without is_job_running
+                self.retries += 1
+                return 0.01
+            self.error = "Render of {} couldn't be started".format(job.name)
+            self.stop = True
+            self.finish()
+            return None
+        self.retries = 0
+        return None
+
+    def start_finals(self, scene):
+        """Switch from draft pass to finals, strips flagged while reviewing drafts first"""
+        self.draft_snapshot.restore(scene)
+        flagged = { strip.name: strip.flag_time for strip in scene.rs_settings.strips if strip.flagged }
+        self.jobs = deque(order_flagged(self.final_jobs, flagged))
+        self.final_jobs = None
+        self.pipeline.start()
+        self.summary.append("drafts rendered")
+
+    def finish(self):
+        bpy.app.handlers.render_init.remove(self._init)
+        bpy.app.handlers.render_complete.remove(self._complete)
+        bpy.app.handlers.render_cancel.remove(self._cancel)
+        # modal closes the operator even if teardown fails
+        self.done = True
+        # revert to original
+        scene = bpy.context.scene
+        try:
+            if self.final_jobs is not None:
+                # cancelled during draft pass
+                self.final_jobs = None
+                self.draft_snapshot.restore(scene)
+            self.snapshot.restore(scene)
+        finally:
+            failed = self.pipeline.finish(scene)
+            if failed:
+                self.summary.append("failed strips: {}".format(", ".join(failed)))
+            if scene.rs_settings.telemetry:
+                self.telemetry.stop()
+                scene.rs_settings.last_report = self.telemetry.save(self.path)
 
     def modal(self, context, event):
-        if event.type == 'TIMER':
-            if self.stop or not self.strips:
-                bpy.app.handlers.render_init.remove(self._init)
-                bpy.app.handlers.render_complete.remove(self._complete)
-                bpy.app.handlers.render_cancel.remove(self._cancel)
-                bpy.context.window_manager.event_timer_remove(self._timer)
-                # revert to original
-                bpy.context.scene.camera = self.camera
-                bpy.context.scene.frame_start = self.frame_start
-                bpy.context.scene.frame_end = self.frame_end
-                bpy.context.scene.render.filepath = self.path
-                self.apply_default_render_settings()
-                return {"FINISHED"}
-
-            elif self.rendering is False:
-                path,strip = list(self.strips.items())[0]
-                sc = bpy.context.scene
-                sc.camera = bpy.data.objects[strip.cam]
-                sc.frame_start = strip.start
-                sc.frame_end = strip.end
-                sc.render.filepath = self.path + path
-                sc.render.filepath += "/" if sc.rs_settings.separate_dir else "."
-                if strip.custom_render:
-                    self.apply_strip_render_settings(strip)
-                else:
-                    self.apply_default_render_settings()
-                bpy.ops.render.render("INVOKE_DEFAULT", animation=True)
+        if event.type == 'TIMER' and self.done:
+            context.window_manager.event_timer_remove(self._timer)
+            if self.idle_times:
+                self.summary.append("inter-strip idle time: total {:.3f}s, max {:.3f}s over {} switches".format(sum(self.idle_times), max(self.idle_times), len(self.idle_times)))
+            if self.error is not None:
+                self.report({"ERROR"}, "Render Strip stopped: {}".format(self.error))
+            elif self.summary:
+                self.report({"INFO"}, ", ".join(self.summary))
+            return {"FINISHED"}
 
         return {"PASS_THROUGH"}
 
 
+class RsOverride(bpy.types.PropertyGroup):
+    path: bpy.props.StringProperty(name="Property", description="Data path of property relative to scene, e.g. render.image_settings.file_format or cycles.samples")
+    value: bpy.props.StringProperty(name="Value", description="Value of property while strip renders")
+
+
+class RsCollection(bpy.types.PropertyGroup):
+    collection: bpy.props.PointerProperty(name="Collection", type=bpy.types.Collection)
+
+
 class RsStrip(bpy.types.PropertyGroup):
 
     def get_start(self):
@@ -140,38 +230,22 @@ class RsStrip(bpy.types.PropertyGroup):
         return self.get("name", "Strip")
 
     def set_name(self, value):
-        strips = { strip.name: strip for strip in bpy.context.scene.rs_settings.strips if strip.as_pointer() != self.as_pointer()}
-        if value not in strips:
-            self["name"] = value
-        else:
-            old_strip = strips[value]
-            # next free name
-            def split(x):
-                match = re.search(r'\.(\d+)$', x)
-                if match is None:
-                    return x, None
-                else:
-                    return x[:match.start()],x[match.start()+1:]
-            base_name,number = split(value)
-            if number is None:
-                number = "001"
-            value = base_name
-            count = 1
-            while value in strips:
-                format_str = "{}.{" + ":0>{}".format(len(number)) + "}"
-                value = format_str.format(base_name, count)
-                count += 1
-            self["name"] = value
+        settings = self.id_data.rs_settings
+        current = self.get_name()
+        names = indexes.strip_names(settings)
+        def taken(name):
+            # other strips with name
+            return names.get(name, 0) - (name == current) > 0
+        if taken(value):
+            value = indexes.free_name(settings, value, taken)
+        self["name"] = value
+        indexes.rename_strip(settings, current, value)
 
     def list_cameras(self, context):
-        cameras = []
-        for object in context.scene.objects:
-            if object.type == "CAMERA":
-                cameras.append(object)
-        return [(cam.name, cam.name, cam.name) for cam in cameras]
+        return indexes.camera_items(self.id_data)
 
     def list_render_engines(self, context):
-        return get_available_render_engines()
+        return indexes.engine_items()
 
     enabled: bpy.props.BoolProperty(name="Enable", default=True)
     name: bpy.props.StringProperty(name="Name", get=get_name, set=set_name)
@@ -188,6 +262,31 @@ class RsStrip(bpy.types.PropertyGroup):
     pixel_aspect_x: bpy.props.FloatProperty(name="Aspect X", default=1, min=1, max=200)
     pixel_aspect_y: bpy.props.FloatProperty(name="Aspect Y", default=1, min=1, max=200)
 
+    overrides: bpy.props.CollectionProperty(type=RsOverride)
+    active_override_index: bpy.props.IntProperty(default=0)
+
+    # what is rendered, other collections are excluded while strip renders
+    scope: bpy.props.EnumProperty(name="Render Scope", description="Part of scene rendered by strip", items=[
+        ("ALL", "Whole Scene", "Render everything enabled for rendering"),
+        ("COLLECTIONS", "Collections", "Render only listed collections, their parents and children"),
+        ("VIEW_LAYER", "View Layer", "Render only one view layer"),
+        ("CAMERA", "Camera View", "Render only collections with objects inside camera view at sampled frames, and lights"),
+    ], default="ALL")
+    collections: bpy.props.CollectionProperty(type=RsCollection)
+    active_collection_index: bpy.props.IntProperty(default=0)
+    view_layer: bpy.props.StringProperty(name="View Layer", description="View layer rendered by strip")
+
+    def update_flagged(self, context):
+        if self.flagged:
+            self.flag_time = time.time()
+
+    # flagged by reviewers, rendered first in final pass
+    flagged: bpy.props.BoolProperty(name="Flagged", description="Render final of strip before unflagged ones, in order strips were flagged", default=False, update=update_flagged)
+    flag_time: bpy.props.FloatProperty(default=0)
+
+    # estimated seconds per frame, 0 if not estimated
+    frame_estimate: bpy.props.FloatProperty(name="Frame Estimate", default=0, min=0)
+
 
     def draw(self, context, layout):
         row = layout.row()
@@ -200,6 +299,18 @@ class RsStrip(bpy.types.PropertyGroup):
         frame_field.prop(self, 'end', text="")
         layout.separator()
 
+        row = layout.row()
+        row.prop(self, 'scope')
+        if self.scope == "COLLECTIONS":
+            row = layout.row()
+            row.template_list("RENDER_UL_render_strip_collections", "", self, "collections", self, "active_collection_index", rows=3)
+            col = row.column(align=True)
+            col.operator('rs.addcollection', text="", icon='ADD')
+            col.operator('rs.delcollection', text="", icon='REMOVE')
+        elif self.scope == "VIEW_LAYER":
+            layout.prop_search(self, 'view_layer', context.scene, 'view_layers', text="")
+        layout.separator()
+
         row = layout.row()
         row.prop(self, 'custom_render')
 
@@ -222,6 +333,13 @@ class RsStrip(bpy.types.PropertyGroup):
             subcol.prop(self, "pixel_aspect_x", text="Aspect X")
             subcol.prop(self, "pixel_aspect_y", text="Y")
 
+            layout.label(text="Overrides")
+            row = layout.row()
+            row.template_list("RENDER_UL_render_strip_overrides", "", self, "overrides", self, "active_override_index", rows=3)
+            col = row.column(align=True)
+            col.operator('rs.addoverride', text="", icon='ADD')
+            col.operator('rs.deloverride', text="", icon='REMOVE')
+
 
     def draw_list_item(self, context, layout):
         row = layout.row(align=True)
@@ -229,6 +347,9 @@ class RsStrip(bpy.types.PropertyGroup):
         row.prop(self, 'name', text="", emboss=False)
         row.label(text=self.cam)
         row.label(text="{}-{}".format(self.start,self.end))
+        row.prop(self, 'flagged', text="", icon='BOOKMARKS' if self.flagged else 'DOT', emboss=False)
+        if self.frame_estimate > 0:
+            row.label(text=format_duration(self.frame_estimate * (self.end - self.start + 1)))
 
 
 class RsSettings(bpy.types.PropertyGroup):
@@ -236,6 +357,50 @@ class RsSettings(bpy.types.PropertyGroup):
     strips: bpy.props.CollectionProperty(type=RsStrip)
     active_index: bpy.props.IntProperty(default=0)
 
+    # planning
+    order: bpy.props.EnumProperty(name="Order", items=[
+        ("LIST", "List", "Render strips in list order"),
+        ("SHORTEST", "Shortest First", "Render quickest strips first for fast feedback"),
+        ("LONGEST", "Longest First", "Render slowest strips first for best packing of parallel workers"),
+        ("GROUPED", "Grouped", "Render strips with same engine and resolution together, switching engine as few times as possible"),
+    ], default="LIST")
+    estimate_frames: bpy.props.IntProperty(name="Sample Frames", description="Frames of each strip rendered to estimate its render time", default=3, min=1, max=100)
+    estimate_resolution: bpy.props.IntProperty(name="Sample Resolution", description="Resolution of sample renders, relative to strip resolution", default=25, min=1, max=100, subtype="PERCENTAGE")
+
+    # performance
+    render_mode: bpy.props.EnumProperty(name="Render Mode", items=[
+        ("SEQUENTIAL", "Sequential", "Render strips one after another in this blender"),
+        ("PARALLEL", "Parallel", "Render strips in parallel background blender processes"),
+        ("TILED", "Tiled", "Split every frame into tiles rendered by background blender processes and stitch them, for very large stills"),
+    ], default="SEQUENTIAL")
+    workers: bpy.props.IntProperty(name="Workers", description="Number of background blender processes", default=2, min=1, max=256)
+    threads_per_worker: bpy.props.IntProperty(name="Threads per Worker", description="Render threads of each worker, 0 to share processors evenly between workers", default=0, min=0, max=1024)
+    deduplicate: bpy.props.BoolProperty(name="Deduplicate Frames", description="Render frames shared by strips with same camera and render settings once, and hardlink them into other strips", default=False)
+    skip_static: bpy.props.BoolProperty(name="Reuse Static Frames", description="Link previous output instead of rendering frames where camera, objects and animated properties didn't change", default=False)
+    incremental: bpy.props.BoolProperty(name="Incremental", description="Skip frames whose output exists and was rendered with same camera, render settings and saved .blend file", default=False)
+    telemetry: bpy.props.BoolProperty(name="Write Report", description="Record timings of strips and frames into render_strip_report.json next to output", default=False)
+    last_report: bpy.props.StringProperty(name="Last Report", description="Summary of last render report")
+    encode: bpy.props.BoolProperty(name="Encode Video", description="Encode video of each strip with ffmpeg while its frames are rendered", default=False)
+    keep_frames: bpy.props.BoolProperty(name="Keep Frames", description="Keep image sequence once video is encoded", default=True)
+    ffmpeg_path: bpy.props.StringProperty(name="ffmpeg", description="Path of ffmpeg executable, searched on PATH if empty", subtype="FILE_PATH")
+    encode_args: bpy.props.StringProperty(name="Encoder Arguments", description="ffmpeg output arguments", default="-c:v libx264 -pix_fmt yuv420p -crf 18")
+    encode_queue: bpy.props.IntProperty(name="Queue Size", description="Frames waiting for encoder before render is held back", default=8, min=1, max=1024)
+    draft_pass: bpy.props.BoolProperty(name="Draft Pass", description="Render fast drafts of all strips before finals", default=False)
+    draft_dir: bpy.props.StringProperty(name="Draft Directory", description="Directory under output path for drafts", default="draft")
+    draft_resolution: bpy.props.IntProperty(name="Draft Resolution", description="Resolution of drafts, relative to strip resolution", default=25, min=1, max=100, subtype="PERCENTAGE")
+    draft_samples: bpy.props.IntProperty(name="Draft Samples", description="Render samples of drafts, for Cycles and Eevee", default=8, min=1)
+    draft_step: bpy.props.IntProperty(name="Draft Frame Step", description="Render every n-th frame of drafts", default=1, min=1, max=1000)
+    staging: bpy.props.BoolProperty(name="Stage Output", description="Render frames into local scratch directory and move them to output path in background", default=False)
+    staging_dir: bpy.props.StringProperty(name="Scratch Directory", description="Local directory for rendered frames, each render uses a new directory inside it. System temporary directory if empty", subtype="DIR_PATH")
+    offload_threads: bpy.props.IntProperty(name="Transfer Threads", description="Frames moved to output path at the same time", default=4, min=1, max=64)
+    offload_pending: bpy.props.IntProperty(name="Pending Frames", description="Frames waiting in scratch directory before render is held back", default=32, min=1, max=10000)
+    tiles_x: bpy.props.IntProperty(name="Tiles X", description="Columns of tiles each frame is split into", default=2, min=1, max=64)
+    tiles_y: bpy.props.IntProperty(name="Tiles Y", description="Rows of tiles each frame is split into", default=2, min=1, max=64)
+    tile_overlap: bpy.props.IntProperty(name="Tile Overlap", description="Pixels rendered beyond each tile edge and discarded, so filters at edges match an untiled render", default=16, min=0, max=1024, subtype="PIXEL")
+    split_strips: bpy.props.BoolProperty(name="Split Strips", description="Split strips into frame chunks rendered by different workers", default=True)
+    chunk_frames: bpy.props.IntProperty(name="First Chunk Frames", description="Frames in chunk of a strip before its render time is measured", default=10, min=1)
+    chunk_seconds: bpy.props.FloatProperty(name="Chunk Seconds", description="Target render time of a chunk in seconds, expensive frames get smaller chunks", default=60, min=1)
+
 
 class RENDER_UL_render_strip_list(bpy.types.UIList):
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname):
@@ -246,6 +411,18 @@ class RENDER_UL_render_strip_list(bpy.types.UIList):
             layout.label(text="", icon_value="RENDER_ANIMATION")
 
 
+class RENDER_UL_render_strip_overrides(bpy.types.UIList):
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname):
+        row = layout.row(align=True)
+        row.prop(item, 'path', text="", emboss=False, icon='RNA')
+        row.prop(item, 'value', text="")
+
+
+class RENDER_UL_render_strip_collections(bpy.types.UIList):
+    def draw_item(self, context, layout, data, item, icon, active_data, active_propname):
+        layout.prop(item, 'collection', text="", emboss=False, icon='OUTLINER_COLLECTION')
+
+
 class RENDER_PT_render_strip(bpy.types.Panel):
     bl_label = "Render Strip"
     bl_space_type = 'PROPERTIES'
@@ -264,11 +441,29 @@ class RENDER_PT_render_strip(bpy.types.Panel):
         col.separator()
         col.operator('rs.playstrip', text="", icon='PLAY')
 
+        col.separator()
+        col.menu('OBJECT_MT_StripsMenu', text="", icon='DOWNARROW_HLT')
+
         # col.separator()
         # col.menu('OBJECT_MT_RenderSettingsMenu', text="", icon='DOWNARROW_HLT')
 
         row = layout.row()
-        row.operator('rs.renderstrip', text="Render")
+        if parallel.progress is not None:
+            row.label(text=parallel.progress.text())
+            row.operator('rs.cancelparallelrender', text="", icon='CANCEL')
+        else:
+            row.operator('rs.renderstrip', text="Render")
+            row.operator('rs.estimatestrips', text="", icon='TIME')
+
+        settings = context.scene.rs_settings
+        estimates = [strip.frame_estimate * (strip.end - strip.start + 1) for strip in settings.strips if strip.enabled and strip.frame_estimate > 0]
+        if estimates:
+            eta = sum(estimates)
+            if settings.render_mode == "PARALLEL":
+                eta /= min(settings.workers, len(estimates))
+            elif settings.render_mode == "TILED":
+                eta /= min(settings.workers, settings.tiles_x * settings.tiles_y)
+            layout.label(text="ETA: {}".format(format_duration(eta)), icon='TIME')
 
 
 class RENDER_PT_render_strip_detail(bpy.types.Panel):
@@ -305,6 +500,66 @@ class RENDER_PT_render_strip_settings(bpy.types.Panel):
         col.prop(context.scene.rs_settings, 'separate_dir')
 
 
+class RENDER_PT_render_strip_performance(bpy.types.Panel):
+    bl_label = "Performance"
+    bl_parent_id = "RENDER_PT_render_strip"
+    bl_space_type = 'PROPERTIES'
+    bl_region_type = 'WINDOW'
+    bl_context = "render"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        col = layout.column(align=True)
+        col.use_property_split = True
+        col.use_property_decorate = False
+        settings = context.scene.rs_settings
+        col.prop(settings, 'render_mode')
+        col.prop(settings, 'order')
+        col.prop(settings, 'estimate_frames')
+        col.prop(settings, 'estimate_resolution')
+        if settings.render_mode in ("PARALLEL", "TILED"):
+            col.prop(settings, 'workers')
+            col.prop(settings, 'threads_per_worker')
+        if settings.render_mode == "PARALLEL":
+            col.prop(settings, 'split_strips')
+            if settings.split_strips:
+                col.prop(settings, 'chunk_frames')
+                col.prop(settings, 'chunk_seconds')
+        elif settings.render_mode == "TILED":
+            col.prop(settings, 'tiles_x')
+            col.prop(settings, 'tiles_y')
+            col.prop(settings, 'tile_overlap')
+
+        col = layout.column(align=True)
+        col.use_property_split = True
+        col.use_property_decorate = False
+        col.prop(settings, 'incremental')
+        col.prop(settings, 'deduplicate')
+        col.prop(settings, 'skip_static')
+        if settings.render_mode not in ("PARALLEL", "TILED"):
+            col.prop(settings, 'encode')
+            if settings.encode:
+                col.prop(settings, 'keep_frames')
+                col.prop(settings, 'ffmpeg_path')
+                col.prop(settings, 'encode_args')
+                col.prop(settings, 'encode_queue')
+            col.prop(settings, 'draft_pass')
+            if settings.draft_pass:
+                col.prop(settings, 'draft_dir')
+                col.prop(settings, 'draft_resolution')
+                col.prop(settings, 'draft_samples')
+                col.prop(settings, 'draft_step')
+            col.prop(settings, 'staging')
+            if settings.staging:
+                col.prop(settings, 'staging_dir')
+                col.prop(settings, 'offload_threads')
+                col.prop(settings, 'offload_pending')
+            col.prop(settings, 'telemetry')
+            if settings.telemetry and settings.last_report:
+                layout.label(text=settings.last_report, icon='INFO')
+
+
 class OBJECT_OT_NewStrip(bpy.types.Operator):
     """Add strip from current camera, start-end frame"""
     bl_idname = "rs.newstrip"
@@ -312,7 +567,7 @@ class OBJECT_OT_NewStrip(bpy.types.Operator):
     bl_options = {"UNDO"}
 
     def execute(self, context):
-        if context.scene.render.engine not in get_available_render_engines_values():
+        if not indexes.has_engine(context.scene.render.engine):
             ShowMessageBox(icon="ERROR", message="Unknown render engine: {}".format(context.scene.render.engine))
             return {'CANCELLED'}
         strip = context.scene.rs_settings.strips.add()
@@ -342,11 +597,102 @@ class OBJECT_OT_DeleteStrip(bpy.types.Operator):
         index = context.scene.rs_settings.active_index
         strips = context.scene.rs_settings.strips
         strips.remove(index)
+        indexes.invalidate_names(context.scene.rs_settings)
         if index==len(strips):
             context.scene.rs_settings.active_index = index-1
         return {'FINISHED'}
 
 
+class OBJECT_OT_AddOverride(bpy.types.Operator):
+    """Override a render property while the selected strip renders"""
+    bl_idname = "rs.addoverride"
+    bl_label = "Add Override"
+    bl_options = {"UNDO"}
+
+    @classmethod
+    def poll(cls, context):
+        index = context.scene.rs_settings.active_index
+        strips = context.scene.rs_settings.strips
+        return 0<=index and index<len(strips)
+
+    def execute(self, context):
+        strip = context.scene.rs_settings.strips[context.scene.rs_settings.active_index]
+        override = strip.overrides.add()
+        override.path = "render.resolution_percentage"
+        override.value = format_value(get_value(context.scene, override.path))
+        strip.active_override_index = len(strip.overrides)-1
+        return {'FINISHED'}
+
+
+class OBJECT_OT_DeleteOverride(bpy.types.Operator):
+    """Delete the selected override"""
+    bl_idname = "rs.deloverride"
+    bl_label = "Delete Override"
+    bl_options = {"UNDO"}
+
+    @classmethod
+    def poll(cls, context):
+        index = context.scene.rs_settings.active_index
+        strips = context.scene.rs_settings.strips
+        if not (0<=index and index<len(strips)):
+            return False
+        strip = strips[index]
+        return 0<=strip.active_override_index and strip.active_override_index<len(strip.overrides)
+
+    def execute(self, context):
+        strip = context.scene.rs_settings.strips[context.scene.rs_settings.active_index]
+        index = strip.active_override_index
+        strip.overrides.remove(index)
+        if index==len(strip.overrides):
+            strip.active_override_index = index-1
+        return {'FINISHED'}
+
+
+class OBJECT_OT_AddCollection(bpy.types.Operator):
+    """Render a collection with the selected strip"""
+    bl_idname = "rs.addcollection"
+    bl_label = "Add Collection"
+    bl_options = {"UNDO"}
+
+    @classmethod
+    def poll(cls, context):
+        index = context.scene.rs_settings.active_index
+        strips = context.scene.rs_settings.strips
+        return 0<=index and index<len(strips)
+
+    def execute(self, context):
+        strip = context.scene.rs_settings.strips[context.scene.rs_settings.active_index]
+        item = strip.collections.add()
+        if context.collection is not None and context.collection != context.scene.collection:
+            item.collection = context.collection
+        strip.active_collection_index = len(strip.collections)-1
+        return {'FINISHED'}
+
+
+class OBJECT_OT_DeleteCollection(bpy.types.Operator):
+    """Remove the selected collection from the strip"""
+    bl_idname = "rs.delcollection"
+    bl_label = "Delete Collection"
+    bl_options = {"UNDO"}
+
+    @classmethod
+    def poll(cls, context):
+        index = context.scene.rs_settings.active_index
+        strips = context.scene.rs_settings.strips
+        if not (0<=index and index<len(strips)):
+            return False
+        strip = strips[index]
+        return 0<=strip.active_collection_index and strip.active_collection_index<len(strip.collections)
+
+    def execute(self, context):
+        strip = context.scene.rs_settings.strips[context.scene.rs_settings.active_index]
+        index = strip.active_collection_index
+        strip.collections.remove(index)
+        if index==len(strip.collections):
+            strip.active_collection_index = index-1
+        return {'FINISHED'}
+
+
 class OBJECT_OT_PlayStrip(bpy.types.Operator):
     """Play the selected strip"""
     bl_idname = "rs.playstrip"
@@ -388,7 +734,7 @@ class OBJECT_OT_CopyRenderSettings(bpy.types.Operator):
         return 0<=index and index<len(strips)
 
     def execute(self, context):
-        if context.scene.render.engine not in get_available_render_engines_values():
+        if not indexes.has_engine(context.scene.render.engine):
             ShowMessageBox(icon="ERROR", message="Unknown render engine: {}".format(context.scene.render.engine))
             return {'CANCELLED'}
         index = context.scene.rs_settings.active_index
@@ -419,7 +765,14 @@ class OBJECT_OT_ApplyRenderSettings(bpy.types.Operator):
         strips = context.scene.rs_settings.strips
         strip = strips[index]
         if strip.custom_render:
+            try:
+                overrides = validate_overrides(context.scene, { strip.name: strip })
+            except Exception as e:
+                ShowMessageBox(icon="ERROR", message=str(e))
+                return {'CANCELLED'}
             apply_render_settings(strip.render_engine,strip.resolution_x,strip.resolution_y,strip.resolution_percentage,strip.pixel_aspect_x,strip.pixel_aspect_y)
+            for path,value in overrides.get(strip.name, ()):
+                set_value(context.scene, path, value)
             return {'FINISHED'}
         else:
             ShowMessageBox(icon="ERROR", message="Strip doesn't have custom render settings")
@@ -437,6 +790,122 @@ class OBJECT_MT_RenderSettingsMenu(bpy.types.Menu):
         layout.operator("rs.applyrendersettings", text="Apply to scene", icon="TRIA_UP_BAR")
 
 
+class OBJECT_OT_ImportStrips(bpy.types.Operator, ImportHelper):
+    """Add strips from JSON or CSV file"""
+    bl_idname = "rs.importstrips"
+    bl_label = "Import Strips"
+    bl_options = {"UNDO"}
+
+    filter_glob: bpy.props.StringProperty(default="*.json;*.csv", options={"HIDDEN"})
+    replace: bpy.props.BoolProperty(name="Replace Strips", description="Remove existing strips before import", default=False)
+
+    def execute(self, context):
+        settings = context.scene.rs_settings
+        try:
+            records = strip_io.read_records(self.filepath)
+            existing = () if self.replace else (strip.name for strip in settings.strips)
+            parsed = strip_io.validate_records(context.scene, records, existing)
+        except Exception as e:
+            ShowMessageBox(icon="ERROR", message=str(e))
+            return {'CANCELLED'}
+        if self.replace:
+            settings.strips.clear()
+        self.report({"INFO"}, "{} strips imported".format(strip_io.add_strips(settings, parsed)))
+        settings.active_index = min(max(settings.active_index, 0), len(settings.strips)-1)
+        return {'FINISHED'}
+
+
+class OBJECT_OT_ExportStrips(bpy.types.Operator, ExportHelper):
+    """Save strips to JSON or CSV file"""
+    bl_idname = "rs.exportstrips"
+    bl_label = "Export Strips"
+
+    filename_ext = ".json"
+    filter_glob: bpy.props.StringProperty(default="*.json;*.csv", options={"HIDDEN"})
+
+    def check(self, context):
+        # keep csv extension typed by user
+        if self.filepath.lower().endswith(".csv"):
+            return False
+        return super().check(context)
+
+    def execute(self, context):
+        try:
+            count = strip_io.write_strips(self.filepath, context.scene.rs_settings.strips)
+        except OSError as e:
+            ShowMessageBox(icon="ERROR", message=str(e))
+            return {'CANCELLED'}
+        self.report({"INFO"}, "{} strips exported".format(count))
+        return {'FINISHED'}
+
+
+class OBJECT_OT_StripsFromMarkers(bpy.types.Operator):
+    """Add a strip for each timeline marker bound to a camera, lasting until next one"""
+    bl_idname = "rs.stripsfrommarkers"
+    bl_label = "Strips from Markers"
+    bl_options = {"UNDO"}
+
+    def execute(self, context):
+        settings = context.scene.rs_settings
+        # markers may share names, strips can't
+        records = strip_io.unique_names(settings, strip_io.marker_records(context.scene))
+        if not records:
+            ShowMessageBox(icon="ERROR", message="No markers bound to cameras")
+            return {'CANCELLED'}
+        try:
+            parsed = strip_io.validate_records(context.scene, records, (strip.name for strip in settings.strips))
+        except Exception as e:
+            ShowMessageBox(icon="ERROR", message=str(e))
+            return {'CANCELLED'}
+        self.report({"INFO"}, "{} strips added".format(strip_io.add_strips(settings, parsed)))
+        return {'FINISHED'}
+
+
+class OBJECT_MT_StripsMenu(bpy.types.Menu):
+    bl_idname = "OBJECT_MT_StripsMenu"
+    bl_label = "Strips menu"
+
+    def draw(self, context):
+        layout = self.layout
+
+        layout.operator("rs.importstrips", icon="IMPORT")
+        layout.operator("rs.exportstrips", icon="EXPORT")
+        layout.separator()
+        layout.operator("rs.stripsfrommarkers", icon="MARKER_HLT")
+
+
+class OBJECT_OT_EstimateStrips(bpy.types.Operator):
+    """Estimate render time of enabled strips from low resolution sample renders"""
+    bl_idname = "rs.estimatestrips"
+    bl_label = "Estimate Render Time"
+
+    def execute(self, context):
+        scene = context.scene
+        settings = scene.rs_settings
+        try:
+            strips = validate_strips(scene, [strip for strip in settings.strips if strip.enabled])
+        except Exception as e:
+            ShowMessageBox(icon="ERROR", message=str(e))
+            return {"CANCELLED"}
+
+        frame_current = scene.frame_current
+        try:
+            jobs, snapshot = prepare_scene_jobs(scene, strips, scene.render.filepath, settings.separate_dir)
+        except Exception as e:
+            ShowMessageBox(icon="ERROR", message=str(e))
+            return {"CANCELLED"}
+        try:
+            for job in jobs:
+                strips[job.name].frame_estimate = estimate_frame_seconds(scene, job, settings.estimate_frames, settings.estimate_resolution)
+        finally:
+            snapshot.restore(scene)
+            scene.frame_set(frame_current)
+
+        total = sum(strip.frame_estimate * (strip.end - strip.start + 1) for strip in strips.values())
+        self.report({"INFO"}, "Estimated render time: {}".format(format_duration(total)))
+        return {'FINISHED'}
+
+
 class OBJECT_OT_RenderStrip(bpy.types.Operator):
     """Render all enabled strips"""
     bl_idname = "rs.renderstrip"
@@ -447,5 +916,8 @@ class OBJECT_OT_RenderStrip(bpy.types.Operator):
             ShowMessageBox(icon="ERROR", message="Output path not defined. Please, define the output path on the render settings panel")
             return {"CANCELLED"}
 
-        bpy.ops.render.renderstrip()
+        if bpy.context.scene.rs_settings.render_mode in ("PARALLEL", "TILED"):
+            bpy.ops.render.renderstrip_parallel()
+        else:
+            bpy.ops.render.renderstrip()
         return{'FINISHED'}
@@ -0,0 +1,132 @@
+import bpy
+import hashlib
+
+# modifiers whose result changes with frame without animated properties
+TIME_DEPENDENT_MODIFIERS = {"CLOTH", "COLLISION", "DYNAMIC_PAINT", "EXPLODE", "FLUID", "FLUID_SIMULATION", "MESH_CACHE", "MESH_SEQUENCE_CACHE", "NODES", "OCEAN", "PARTICLE_SYSTEM", "SMOKE", "SOFT_BODY", "WAVE", "BUILD"}
+
+PRECISION = 6
+
+
+def rounded(values):
+    return tuple(round(value, PRECISION) for value in values)
+
+
+def is_frame_dependent(scene):
+    """Whether frames differ even when nothing is animated, e.g. animated noise seed or movie textures"""
+    if getattr(getattr(scene, "cycles", None), "use_animated_seed", False):
+        return True
+    if scene.rigidbody_world is not None and scene.rigidbody_world.enabled:
+        return True
+    for obj in scene.objects:
+        # particles, strokes and built faces aren't caught by bounds of evaluated objects
+        if obj.type in {"GPENCIL", "GREASEPENCIL"} or len(getattr(obj, "particle_systems", ())) > 0:
+            return True
+        if any(modifier.type == "BUILD" for modifier in getattr(obj, "modifiers", ())):
+            return True
+    return any(image.source in {"SEQUENCE", "MOVIE"} for image in bpy.data.images)
+
+
+def animated_ids():
+    """Yields name, ID and owner of data which may be animated, owner is the ID itself unless embedded"""
+    for collection in (bpy.data.objects, bpy.data.meshes, bpy.data.curves, bpy.data.cameras, bpy.data.lights, bpy.data.materials, bpy.data.worlds, bpy.data.node_groups, bpy.data.shape_keys, bpy.data.scenes):
+        for id in collection:
+            yield id.name, id, id
+            # node trees embedded in materials, lights, worlds and scene compositor
+            node_tree = getattr(id, "node_tree", None)
+            if node_tree is not None:
+                yield id.name + ".node_tree", node_tree, id
+
+
+def animated_values(depsgraph):
+    """Evaluated values of every property driven by an action or driver"""
+    values = []
+    for name,id,owner in animated_ids():
+        animation_data = getattr(id, "animation_data", None)
+        if animation_data is None:
+            continue
+        fcurves = list(animation_data.drivers)
+        if animation_data.action is not None:
+            fcurves += list(animation_data.action.fcurves)
+        evaluated = owner.evaluated_get(depsgraph) if hasattr(owner, "evaluated_get") else owner
+        if owner is not id:
+            evaluated = getattr(evaluated, "node_tree", None) or id
+        for fcurve in fcurves:
+            try:
+                value = evaluated.path_resolve(fcurve.data_path)
+            except ValueError:
+                continue
+            if hasattr(value, "__len__") and not isinstance(value, str):
+                value = value[fcurve.array_index] if fcurve.array_index < len(value) else None
+            if isinstance(value, float):
+                value = round(value, PRECISION)
+            elif not isinstance(value, (int, bool, str)):
+                value = str(value)
+            values.append((name, fcurve.data_path, fcurve.array_index, value))
+    return values
+
+
+def scene_fingerprint(scene, depsgraph):
+    """Cheap hash of evaluated scene state at current frame, cameras excluded"""
+    sha = hashlib.sha1()
+    for obj in depsgraph.objects:
+        if obj.type == "CAMERA":
+            continue
+        sha.update(repr((obj.name, rounded(value for row in obj.matrix_world for value in row), obj.hide_render)).encode())
+        if any(modifier.type in TIME_DEPENDENT_MODIFIERS for modifier in getattr(obj, "modifiers", ())):
+            # evaluated geometry, approximated by its bounds
+            sha.update(repr(rounded(value for corner in obj.bound_box for value in corner)).encode())
+    sha.update(repr(animated_values(depsgraph)).encode())
+    return sha.hexdigest()
+
+
+def camera_fingerprint(camera):
+    return (rounded(value for row in camera.matrix_world for value in row), camera.data.lens, camera.data.shift_x, camera.data.shift_y, camera.data.clip_start, camera.data.clip_end)
+
+
+def frame_fingerprints(scene, frames, cameras):
+    """Returns {(camera, frame): fingerprint}, evaluating each frame once"""
+    fingerprints = {}
+    frame_current = scene.frame_current
+    try:
+        for frame in sorted(frames):
+            scene.frame_set(frame)
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+            state = scene_fingerprint(scene, depsgraph)
+            for cam in cameras:
+                camera = bpy.data.objects[cam].evaluated_get(depsgraph)
+                fingerprints[(cam, frame)] = (state, camera_fingerprint(camera))
+    finally:
+        scene.frame_set(frame_current)
+    return fingerprints
+
+
+def plan_static_frames(scene, jobs):
+    """Reuse previous output for frames identical to the previous frame of same strip.
+
+    Jobs are split around static frames. Returns jobs to render and
+    (source, destination) outputs to link once rendered.
+    """
+    if scene.render.is_movie_format or is_frame_dependent(scene) or not jobs:
+        return list(jobs), []
+    frames = set(frame for job in jobs for frame in range(job.start, job.end+1))
+    fingerprints = frame_fingerprints(scene, frames, set(job.cam for job in jobs))
+    planned = []
+    links = []
+    for job in jobs:
+        paths = job.frame_paths(scene)
+        # first frame of current hold, which is rendered
+        source = job.start
+        start = job.start
+        for frame in range(job.start+1, job.end+1):
+            if fingerprints[(job.cam, frame)] == fingerprints[(job.cam, frame-1)]:
+                links.append((paths[source], paths[frame]))
+                if start is not None:
+                    planned.append(job.split(start, frame-1))
+                    start = None
+            else:
+                source = frame
+                if start is None:
+                    start = frame
+        if start is not None:
+            planned.append(job.split(start, job.end))
+    return planned, links
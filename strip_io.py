@@ -0,0 +1,173 @@
+import bpy
+import csv
+import json
+import os
+
+from . import indexes
+
+# columns of exported strips, in csv overrides are "path=value" pairs and
+# collections are names, both separated by ";"
+FIELDS = ("name", "enabled", "cam", "start", "end", "scope", "collections", "view_layer", "custom_render", "render_engine", "resolution_x", "resolution_y", "resolution_percentage", "pixel_aspect_x", "pixel_aspect_y", "overrides")
+REQUIRED = ("name", "cam", "start", "end")
+SCOPES = ("ALL", "COLLECTIONS", "VIEW_LAYER", "CAMERA")
+TYPES = {
+    "enabled": bool,
+    "start": int,
+    "end": int,
+    "custom_render": bool,
+    "resolution_x": int,
+    "resolution_y": int,
+    "resolution_percentage": int,
+    "pixel_aspect_x": float,
+    "pixel_aspect_y": float,
+}
+
+
+def strip_record(strip):
+    record = { field: getattr(strip, field) for field in FIELDS if field not in ("overrides", "collections") }
+    record["collections"] = [item.collection.name for item in strip.collections if item.collection is not None]
+    record["overrides"] = [{"path": override.path, "value": override.value} for override in strip.overrides]
+    return record
+
+
+def write_strips(filepath, strips):
+    records = [strip_record(strip) for strip in strips]
+    if os.path.splitext(filepath)[1].lower() == ".csv":
+        with open(filepath, "w", newline="") as f:
+            writer = csv.DictWriter(f, FIELDS)
+            writer.writeheader()
+            for record in records:
+                record["overrides"] = ";".join("{}={}".format(override["path"], override["value"]) for override in record["overrides"])
+                record["collections"] = ";".join(record["collections"])
+                writer.writerow(record)
+    else:
+        with open(filepath, "w") as f:
+            json.dump({"strips": records}, f, indent=2)
+    return len(records)
+
+
+def read_records(filepath):
+    """Records of strips in json or csv file, values as written"""
+    if os.path.splitext(filepath)[1].lower() == ".csv":
+        with open(filepath, newline="") as f:
+            records = list(csv.DictReader(f))
+        for record in records:
+            text = record.get("overrides") or ""
+            record["overrides"] = [dict(zip(("path", "value"), item.split("=", 1))) for item in text.split(";") if "=" in item]
+            record["collections"] = [name for name in (record.get("collections") or "").split(";") if name]
+        return records
+    with open(filepath) as f:
+        data = json.load(f)
+    return data["strips"] if isinstance(data, dict) else data
+
+
+def parse_field(field, value):
+    if value is None or value == "":
+        return None
+    kind = TYPES.get(field, str)
+    if kind is bool and isinstance(value, str):
+        if value.strip().lower() not in ("1", "true", "yes", "on", "0", "false", "no", "off"):
+            raise ValueError(value)
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    if kind is int and isinstance(value, str):
+        return int(float(value))
+    return kind(value)
+
+
+def validate_records(scene, records, existing=()):
+    """Parse and check records in one pass: unique names, known cameras and engines, start <= end.
+
+    Returns parsed records, raises Exception listing invalid ones.
+    """
+    cameras = set(item[0] for item in indexes.camera_items(scene))
+    names = set(existing)
+    parsed = []
+    errors = []
+    for number,record in enumerate(records, 1):
+        try:
+            strip = {}
+            for field in FIELDS:
+                if field == "overrides":
+                    strip[field] = [(str(override["path"]), str(override["value"])) for override in record.get(field) or ()]
+                    continue
+                if field == "collections":
+                    strip[field] = [str(name) for name in record.get(field) or ()]
+                    continue
+                try:
+                    value = parse_field(field, record.get(field))
+                except (ValueError, TypeError):
+                    raise Exception("invalid {} {}".format(field, record.get(field)))
+                if value is None and field in REQUIRED:
+                    raise Exception("missing {}".format(field))
+                if value is not None:
+                    strip[field] = value
+        except Exception as e:
+            errors.append("row {}: {}".format(number, e))
+            continue
+        name = strip["name"]
+        if name in names:
+            errors.append("row {}: duplicate name {}".format(number, name))
+        names.add(name)
+        if strip["cam"] not in cameras:
+            errors.append("row {}: unknown camera {}".format(number, strip["cam"]))
+        if not 1 <= strip["start"] <= strip["end"]:
+            errors.append("row {}: invalid frames {}-{}".format(number, strip["start"], strip["end"]))
+        unknown = [name for name in strip["collections"] if name not in bpy.data.collections]
+        if unknown:
+            errors.append("row {}: unknown collections {}".format(number, ", ".join(unknown)))
+        if strip.get("scope", "ALL") not in SCOPES:
+            errors.append("row {}: unknown scope {}".format(number, strip["scope"]))
+        if "render_engine" in strip and not indexes.has_engine(strip["render_engine"]):
+            errors.append("row {}: unknown render engine {}".format(number, strip["render_engine"]))
+        parsed.append(strip)
+    if errors:
+        more = " and {} more".format(len(errors) - 5) if len(errors) > 5 else ""
+        raise Exception("Invalid strips: {}{}".format(", ".join(errors[:5]), more))
+    return parsed
+
+
+def add_strips(settings, parsed):
+    """Append validated strips, writing stored values directly instead of through per strip setters"""
+    for values in parsed:
+        strip = settings.strips.add()
+        for field,value in values.items():
+            if field == "overrides":
+                for path,text in value:
+                    override = strip.overrides.add()
+                    override.path = path
+                    override.value = text
+            elif field == "collections":
+                for name in value:
+                    strip.collections.add().collection = bpy.data.collections[name]
+            elif field in ("name", "start", "end"):
+                # setters would look for free name and clamp frames, both done by validation
+                strip[field] = value
+            else:
+                setattr(strip, field, value)
+    indexes.invalidate_names(settings)
+    return len(parsed)
+
+
+def marker_records(scene):
+    """Records of strips from markers bound to cameras, each lasting until next such marker or scene end"""
+    markers = sorted((marker for marker in scene.timeline_markers if marker.camera is not None), key=lambda marker: marker.frame)
+    records = []
+    for i,marker in enumerate(markers):
+        end = markers[i+1].frame - 1 if i+1 < len(markers) else scene.frame_end
+        if end < marker.frame:
+            # markers on same frame, later one wins
+            continue
+        records.append({"name": marker.name, "cam": marker.camera.name, "start": max(1, marker.frame), "end": end})
+    return records
+
+
+def unique_names(settings, records):
+    """Give records named like a strip or an earlier record a free .001 suffix"""
+    index = indexes.strip_names(settings)
+    names = set()
+    taken = lambda name: name in index or name in names
+    for record in records:
+        if taken(record["name"]):
+            record["name"] = indexes.free_name(settings, record["name"], taken)
+        names.add(record["name"])
+    return records
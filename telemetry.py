@@ -0,0 +1,133 @@
+import bpy
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+REPORT_NAME = "render_strip_report.json"
+
+
+def peak_memory_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / (1 << 10)
+
+
+class StripTelemetry:
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.finished = None
+        self.switch_seconds = 0
+        self.frames = []
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "wall_seconds": (self.finished or time.perf_counter()) - self.started,
+            "switch_seconds": self.switch_seconds,
+            "frames": len(self.frames),
+            "render_seconds": sum(frame["render_seconds"] for frame in self.frames),
+            "write_seconds": sum(frame["write_seconds"] or 0 for frame in self.frames),
+        }
+
+
+class RenderTelemetry:
+    """Timings of strip switching, frame render and file write through render handlers"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.timings = {}
+        self.strips = []
+        self.frame_started = None
+        self.frame_rendered = None
+
+    def _pre(self, scene, depsgraph=None):
+        self.frame_started = time.perf_counter()
+
+    def _post(self, scene, depsgraph=None):
+        now = time.perf_counter()
+        self.frame_rendered = now
+        if self.strips and self.frame_started is not None:
+            self.strips[-1].frames.append({ "frame": scene.frame_current, "render_seconds": now - self.frame_started, "write_seconds": None })
+
+    def _write(self, scene, depsgraph=None):
+        if self.strips and self.strips[-1].frames and self.frame_rendered is not None:
+            self.strips[-1].frames[-1]["write_seconds"] = time.perf_counter() - self.frame_rendered
+
+    def start(self):
+        bpy.app.handlers.render_pre.append(self._pre)
+        bpy.app.handlers.render_post.append(self._post)
+        bpy.app.handlers.render_write.append(self._write)
+
+    def stop(self):
+        bpy.app.handlers.render_pre.remove(self._pre)
+        bpy.app.handlers.render_post.remove(self._post)
+        bpy.app.handlers.render_write.remove(self._write)
+        if self.strips:
+            self.strips[-1].finished = time.perf_counter()
+
+    @contextmanager
+    def measure(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0) + time.perf_counter() - started
+
+    @contextmanager
+    def switch(self, name):
+        """Measure applying camera and render settings of next strip"""
+        if self.strips:
+            self.strips[-1].finished = time.perf_counter()
+        strip = StripTelemetry(name)
+        self.strips.append(strip)
+        try:
+            yield
+        finally:
+            strip.switch_seconds += time.perf_counter() - strip.started
+
+    def report(self):
+        strips = [strip.to_dict() for strip in self.strips]
+        return {
+            "blend": bpy.data.filepath,
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "wall_seconds": time.time() - self.started,
+            "timings": self.timings,
+            "peak_memory_mb": peak_memory_mb(),
+            "strips": strips,
+            "frames": [dict(frame, strip=strip.name) for strip in self.strips for frame in strip.frames],
+        }
+
+    def summary(self, report):
+        frames = report["frames"]
+        text = "{} frames in {:.1f}s, render {:.1f}s, write {:.1f}s, switch {:.1f}s".format(
+            len(frames),
+            report["wall_seconds"],
+            sum(frame["render_seconds"] for frame in frames),
+            sum(frame["write_seconds"] or 0 for frame in frames),
+            sum(strip["switch_seconds"] for strip in report["strips"]),
+        )
+        if report["strips"]:
+            slowest = max(report["strips"], key=lambda strip: strip["wall_seconds"])
+            text += ", slowest {} ({:.1f}s)".format(slowest["name"], slowest["wall_seconds"])
+        if report["peak_memory_mb"] is not None:
+            text += ", peak {:.0f}MB".format(report["peak_memory_mb"])
+        return text
+
+    def save(self, path):
+        """Write report next to output path. Returns summary"""
+        report = self.report()
+        directory = os.path.dirname(bpy.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, REPORT_NAME), "w") as f:
+            json.dump(report, f, indent=1)
+        return self.summary(report)
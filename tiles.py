@@ -0,0 +1,181 @@
+import bpy
+import numpy
+import os
+from collections import deque
+
+from .jobs import prepare_scene_jobs
+from .overrides import RenderSnapshot, set_value
+
+# render settings changed while a tile renders, tiles are lossless float so
+# stitched frame goes through same color management as an untiled render
+TILE_PATHS = (
+    "render.use_border",
+    "render.use_crop_to_border",
+    "render.border_min_x",
+    "render.border_max_x",
+    "render.border_min_y",
+    "render.border_max_y",
+    "render.use_file_extension",
+    "render.image_settings.file_format",
+    "render.image_settings.color_mode",
+    "render.image_settings.color_depth",
+    "render.image_settings.exr_codec",
+)
+
+
+def tile_regions(width, height, tiles_x, tiles_y, overlap):
+    """[(core, region), ...] pixel rectangles (x0, y0, x1, y1) of a frame.
+
+    Cores cover the frame exactly once, regions are cores grown by overlap
+    and are what is rendered, so filters at tile edges see same neighbours as
+    an untiled render.
+    """
+    xs = [width * i // tiles_x for i in range(tiles_x + 1)]
+    ys = [height * i // tiles_y for i in range(tiles_y + 1)]
+    tiles = []
+    for j in range(tiles_y):
+        for i in range(tiles_x):
+            core = (xs[i], ys[j], xs[i+1], ys[j+1])
+            if core[0] == core[2] or core[1] == core[3]:
+                continue
+            region = (max(0, core[0] - overlap), max(0, core[1] - overlap), min(width, core[2] + overlap), min(height, core[3] + overlap))
+            tiles.append((core, region))
+    return tiles
+
+
+def tile_stem(directory, name, region):
+    return os.path.join(directory, "{}_{}_{}_{}_{}_".format(bpy.path.clean_name(name), *region))
+
+
+def tile_path(directory, name, frame, region):
+    return tile_stem(directory, name, region) + "{:06d}.exr".format(frame)
+
+
+def border(start, end, size):
+    # blender truncates border * size to pixels, quarter pixel keeps float error on right side
+    return min(1.0, (start + 0.25) / size), min(1.0, (end + 0.25) / size)
+
+
+def render_tile(scene, strips, frame, region, directory):
+    """Render region of frame of strip into lossless tile in directory"""
+    jobs, snapshot = prepare_scene_jobs(scene, strips, directory, True)
+    job = jobs[0]
+    tile_snapshot = RenderSnapshot(scene, TILE_PATHS)
+    try:
+        job.apply(scene)
+        render = scene.render
+        width, height = job.pixel_size()
+        render.use_border = True
+        render.use_crop_to_border = True
+        render.border_min_x, render.border_max_x = border(region[0], region[2], width)
+        render.border_min_y, render.border_max_y = border(region[1], region[3], height)
+        render.use_file_extension = True
+        render.image_settings.file_format = "OPEN_EXR"
+        render.image_settings.color_mode = "RGBA"
+        render.image_settings.color_depth = "32"
+        render.image_settings.exr_codec = "ZIP"
+        # frame number padded to six digits, as expected by tile_path
+        render.filepath = tile_stem(directory, job.name, region) + "######"
+        path = tile_path(directory, job.name, frame, region)
+        if scene.frame_current != frame:
+            scene.frame_set(frame)
+        bpy.ops.render.render("EXEC_DEFAULT", write_still=True)
+        if not os.path.exists(path):
+            raise RuntimeError("Tile not written: {}".format(path))
+    finally:
+        tile_snapshot.restore(scene)
+        snapshot.restore(scene)
+
+
+def load_tile(path, width, height):
+    image = bpy.data.images.load(path, check_existing=False)
+    try:
+        if tuple(image.size) != (width, height):
+            raise Exception("Tile {} is {}x{}, expected {}x{}".format(os.path.basename(path), image.size[0], image.size[1], width, height))
+        pixels = numpy.empty(width * height * 4, dtype=numpy.float32)
+        image.pixels.foreach_get(pixels)
+    finally:
+        bpy.data.images.remove(image)
+    # rows from bottom, like border coordinates
+    return pixels.reshape(height, width, 4)
+
+
+def stitch(scene, job, frame, tiles, directory):
+    """Assemble rendered tiles of frame and save it to output of job with its output settings"""
+    width, height = job.pixel_size()
+    pixels = numpy.zeros((height, width, 4), dtype=numpy.float32)
+    for core,region in tiles:
+        tile = load_tile(tile_path(directory, job.name, frame, region), region[2] - region[0], region[3] - region[1])
+        pixels[core[1]:core[3], core[0]:core[2]] = tile[core[1]-region[1]:core[3]-region[1], core[0]-region[0]:core[2]-region[0]]
+    destination = job.frame_paths(scene)[frame]
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    image = bpy.data.images.new("Render Strip Tiles", width, height, alpha=True, float_buffer=True)
+    # rendered pixels are premultiplied, as in a render result
+    image.alpha_mode = "PREMUL"
+    snapshot = RenderSnapshot(scene, [path for path,_ in job.overrides])
+    try:
+        image.pixels.foreach_set(pixels.ravel())
+        # color management and file format of strip apply as for a render
+        for path,value in job.overrides:
+            set_value(scene, path, value)
+        image.save_render(destination, scene=scene)
+    finally:
+        snapshot.restore(scene)
+        bpy.data.images.remove(image)
+    for _,region in tiles:
+        os.remove(tile_path(directory, job.name, frame, region))
+
+
+class TileScheduler:
+    """Hand out tiles of every frame of jobs, stitching a frame once all its tiles are rendered"""
+
+    def __init__(self, scene, jobs, tiles_x, tiles_y, overlap, directory):
+        self.scene = scene
+        self.directory = directory
+        # [name, frame, region] of tiles not handed out yet
+        self.remaining = deque()
+        self.jobs = {}
+        self.tiles = {}
+        # tiles left per (name, frame), frames left per name
+        self.outstanding = {}
+        self.frames = {}
+        for job in jobs:
+            paths = job.frame_paths(scene)
+            width, height = job.pixel_size()
+            tiles = tile_regions(width, height, tiles_x, tiles_y, overlap)
+            for frame in range(job.start, job.end+1):
+                # still renders ignore overwrite setting, so skip existing outputs here
+                if not job.overwrite(scene) and os.path.exists(paths[frame]):
+                    continue
+                self.jobs[(job.name, frame)] = job
+                self.tiles[(job.name, frame)] = tiles
+                self.outstanding[(job.name, frame)] = len(tiles)
+                self.frames[job.name] = self.frames.get(job.name, 0) + 1
+                self.remaining.extend([job.name, frame, region] for _,region in tiles)
+
+    def remaining_tiles(self):
+        return len(self.remaining)
+
+    def pending_strips(self):
+        """Names of strips with frames to render"""
+        return set(self.frames)
+
+    def next_job(self):
+        if not self.remaining:
+            return None
+        name, frame, region = self.remaining.popleft()
+        return "\t".join(str(field) for field in (name, frame, frame) + region)
+
+    def finish_job(self, job):
+        """Stitch frame of finished tile once complete. Returns strip name if it was its last frame"""
+        name, frame, *_ = job.split("\t")
+        key = (name, int(frame))
+        self.outstanding[key] -= 1
+        if self.outstanding[key] > 0:
+            return None
+        self.frames[name] -= 1
+        try:
+            stitch(self.scene, self.jobs[key], key[1], self.tiles[key], self.directory)
+        except Exception as e:
+            raise Exception("{} frame {}: {}".format(name, frame, e))
+        return name if self.frames[name] == 0 else None
@@ -1,12 +1,18 @@
 import bpy
+from collections import OrderedDict
+
+from .overrides import format_value, get_value
 
 def apply_render_settings(render_engine,resolution_x,resolution_y,resolution_percentage,pixel_aspect_x,pixel_aspect_y):
-    bpy.context.scene.render.engine = render_engine
-    bpy.context.scene.render.resolution_x = resolution_x
-    bpy.context.scene.render.resolution_y = resolution_y
-    bpy.context.scene.render.resolution_percentage = resolution_percentage
-    bpy.context.scene.render.pixel_aspect_x = pixel_aspect_x
-    bpy.context.scene.render.pixel_aspect_y = pixel_aspect_y
+    """Write only render settings which differ, so unchanged engine isn't restarted. Returns names of changed settings"""
+    render = bpy.context.scene.render
+    changed = []
+    for name,value in (("engine", render_engine), ("resolution_x", resolution_x), ("resolution_y", resolution_y), ("resolution_percentage", resolution_percentage), ("pixel_aspect_x", pixel_aspect_x), ("pixel_aspect_y", pixel_aspect_y)):
+        current = getattr(render, name)
+        if current != value and not (isinstance(value, float) and abs(current - value) < 1e-6):
+            setattr(render, name, value)
+            changed.append(name)
+    return changed
 
 def copy_render_settings(strip):
     scene = bpy.context.scene
@@ -16,15 +22,45 @@ def copy_render_settings(strip):
     strip.resolution_percentage = scene.render.resolution_percentage
     strip.pixel_aspect_x = scene.render.pixel_aspect_x
     strip.pixel_aspect_y = scene.render.pixel_aspect_y
+    for override in strip.overrides:
+        try:
+            override.value = format_value(get_value(scene, override.path))
+        except Exception:
+            # invalid path is reported when strip is rendered
+            pass
+
+def validate_strips(scene, strips):
+    if any(strip.cam not in scene.objects or scene.objects[strip.cam].type != "CAMERA" for strip in strips):
+        raise Exception("Invalid Camera in strips!")
+    if not all(strip.name for strip in strips):
+        raise Exception("Invalid Name in strips!")
+    validated = OrderedDict({
+        strip.name: strip
+        for strip in strips
+    })
+    if len(validated) == 0:
+        raise Exception("No active strip")
+    if len(validated)<len(strips):
+        raise Exception("Multiple strip with same name found. Please use unique name")
+    return validated
+
+def strip_output_path(path, name, separate_dir):
+    return path + name + ("/" if separate_dir else ".")
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return "{}h {:02d}m".format(hours, minutes)
+    if minutes:
+        return "{}m {:02d}s".format(minutes, seconds)
+    return "{}s".format(seconds)
 
 def get_available_render_engines():
     internal_engines = [("BLENDER_EEVEE","Eevee","Eevee"), ("BLENDER_WORKBENCH","Workbench","Workbench")]
     external_engines = set((e.bl_idname,e.bl_label,e.bl_label) for e in bpy.types.RenderEngine.__subclasses__() if hasattr(e, "bl_idname") and hasattr(e, "bl_label"))
     return internal_engines + list(external_engines)
 
-def get_available_render_engines_values():
-    return [e[0] for e in get_available_render_engines()]
-
 def ShowMessageBox(message = "", title = "Message Box", icon = 'INFO'):
 
     def draw(self, context):
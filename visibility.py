@@ -0,0 +1,133 @@
+import bpy
+from bpy_extras.object_utils import world_to_camera_view
+from mathutils import Vector
+
+# frames evaluated to find what camera of a strip sees
+FRUSTUM_SAMPLES = 16
+# margin around camera frame, in frame widths, for motion between samples
+FRUSTUM_MARGIN = 0.1
+# objects rendering nothing of their own, unless instancing
+UNRENDERED_TYPES = ("EMPTY", "CAMERA", "SPEAKER", "ARMATURE", "LATTICE")
+
+
+def collection_parents(scene):
+    """{collection name: names of its ancestors} for every collection in scene"""
+    parents = {}
+    def walk(collection, ancestors):
+        for child in collection.children:
+            parents.setdefault(child.name, set()).update(ancestors)
+            walk(child, ancestors + (child.name,))
+    walk(scene.collection, ())
+    return parents
+
+
+def current_visibility(scene):
+    """{(kind, name): value} of every collection and view layer render toggle in scene"""
+    values = { ("collection", name): bpy.data.collections[name].hide_render for name in collection_parents(scene) }
+    values.update({ ("view_layer", layer.name): layer.use for layer in scene.view_layers })
+    return values
+
+
+def apply_visibility(scene, visibility):
+    """Write only toggles which differ, like render settings"""
+    for (kind,name),value in visibility:
+        if kind == "collection":
+            owner, attr = bpy.data.collections[name], "hide_render"
+        else:
+            owner, attr = scene.view_layers[name], "use"
+        if getattr(owner, attr) != value:
+            setattr(owner, attr, value)
+
+
+def in_frustum(scene, camera, obj):
+    """Whether bounding box of evaluated object may be seen by camera"""
+    margin = FRUSTUM_MARGIN
+    points = [world_to_camera_view(scene, camera, obj.matrix_world @ Vector(corner)) for corner in obj.bound_box]
+    in_front = [point for point in points if point.z > 0]
+    if not in_front:
+        return False
+    if len(in_front) < len(points):
+        # box crosses camera plane, projection is unreliable
+        return True
+    if min(point.z for point in points) > camera.data.clip_end:
+        return False
+    return (min(point.x for point in points) < 1 + margin and max(point.x for point in points) > -margin and
+            min(point.y for point in points) < 1 + margin and max(point.y for point in points) > -margin)
+
+
+def camera_collections(scene, cam, start, end):
+    """Names of collections holding objects seen by camera at sampled frames of start-end, lights always included"""
+    count = min(FRUSTUM_SAMPLES, end - start + 1)
+    frames = sorted(set(start + round(i * (end - start) / max(1, count - 1)) for i in range(count)))
+    seen = set()
+    frame_current = scene.frame_current
+    try:
+        for frame in frames:
+            scene.frame_set(frame)
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+            camera = bpy.data.objects[cam].evaluated_get(depsgraph)
+            for obj in scene.objects:
+                if obj.name in seen:
+                    continue
+                if obj.type in ("LIGHT", "LIGHT_PROBE") or obj.instance_type != "NONE":
+                    # lit or instanced content isn't bounded by own box
+                    seen.add(obj.name)
+                elif obj.type not in UNRENDERED_TYPES and in_frustum(scene, camera, obj.evaluated_get(depsgraph)):
+                    seen.add(obj.name)
+    finally:
+        scene.frame_set(frame_current)
+    return set(collection.name for name in seen for collection in bpy.data.objects[name].users_collection)
+
+
+def hidden_collections(scene, kept):
+    """Collections to hide so only kept ones, their ancestors and descendants are rendered"""
+    parents = collection_parents(scene)
+    shown = set(kept)
+    for name in kept:
+        shown.update(parents.get(name, ()))
+    return set(name for name,ancestors in parents.items() if name not in shown and not ancestors & set(kept))
+
+
+def strip_visibility(scene, strip):
+    """{(kind, name): value} of toggles changed while strip renders"""
+    if strip.scope == "COLLECTIONS":
+        kept = set(item.collection.name for item in strip.collections if item.collection is not None)
+        if not kept:
+            raise Exception("Strip {}: no collections to render".format(strip.name))
+    elif strip.scope == "CAMERA":
+        kept = camera_collections(scene, strip.cam, strip.start, strip.end)
+    elif strip.scope == "VIEW_LAYER":
+        if strip.view_layer not in scene.view_layers:
+            raise Exception("Strip {}: unknown view layer {}".format(strip.name, strip.view_layer))
+        return { ("view_layer", layer.name): layer.name == strip.view_layer for layer in scene.view_layers }
+    else:
+        return {}
+    return { ("collection", name): True for name in hidden_collections(scene, kept) }
+
+
+def validate_visibility(scene, strips):
+    """Visibility of each strip, with toggles of other strips reset to current values.
+
+    Returns {strip name: ((kind, name), value), ...)} and current values, both empty
+    when no strip is scoped.
+    """
+    scoped = { name: strip_visibility(scene, strip) for name,strip in strips.items() if strip.scope != "ALL" }
+    if not scoped:
+        return {}, {}
+    defaults = current_visibility(scene)
+    visibility = {}
+    for name in strips:
+        values = dict(defaults)
+        values.update(scoped.get(name, {}))
+        visibility[name] = tuple(sorted(values.items()))
+    return visibility, defaults
+
+
+class VisibilitySnapshot:
+    """Render toggles of collections and view layers to restore once strips are rendered"""
+
+    def __init__(self, values):
+        self.values = tuple(values.items())
+
+    def restore(self, scene):
+        apply_visibility(scene, self.values)